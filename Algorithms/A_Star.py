@@ -1,59 +1,59 @@
-def A_Star(grid, start, end):
-    n = len(grid)
-    directions = [(-1,0), (0,1), (0,-1), (1,0)]  # Up, Right, Left, Down
+from Algorithms.compiled_grid import compile_grid
+from Algorithms.frontier import PriorityFrontier
+
+
+def A_Star(grid, start, end, frontier_cls=PriorityFrontier, landmarks=None):
+    # landmarks: an Algorithms.landmarks.Landmarks of this grid to use the ALT bound instead of Manhattan
+    grid = compile_grid(grid)
+    n = grid.n
+    neighbor_ptr, neighbor_idx = grid.neighbor_ptr, grid.neighbor_idx
+    step_cost = grid.step_cost  # 0 for Start/Treasure, 5 for Trap, 1 for empty
     expanded_nodes = 0
     total_heuristic = 0.0
     heuristic_count = 0
 
+    start_idx = grid.index(start)
+    end_idx = grid.index(end)
+    end_r, end_c = end
+
     # Manhattan distance heuristic
-    def heuristic(pos):
-        return abs(pos[0] - end[0]) + abs(pos[1] - end[1])
+    def heuristic(idx):
+        r, c = divmod(idx, n)
+        return abs(r - end_r) + abs(c - end_c)
 
-    pq = [(heuristic(start), start)]  # (f_cost, position) where f = g + h
-    visited = set([start])
-    parent = {start: None}
-    cost_so_far = {start: 0}
+    if landmarks is not None:
+        heuristic = landmarks.heuristic(end)
+
+    pq = frontier_cls()  # (f_cost, cell index) where f = g + h
+    pq.push(start_idx, heuristic(start_idx))
+    parent = {start_idx: None}
+    cost_so_far = {start_idx: 0}
 
     while pq:
-        pq.sort()  # smallest f_cost comes first
-        current_f, current = pq.pop(0)
+        current_f, current = pq.pop()  # smallest f_cost comes first
         expanded_nodes += 1
         total_heuristic += heuristic(current)
         heuristic_count += 1
 
         # Check if we've reached the goal
-        if current == end:
+        if current == end_idx:
             # Reconstruct path
             path = []
             while current is not None:
-                path.append(current)
+                path.append(grid.position(current))
                 current = parent[current]
             path.reverse()
             avg_heuristic = total_heuristic / heuristic_count if heuristic_count > 0 else 0.0
             return path, expanded_nodes, avg_heuristic
-        
-        r, c = current
-        for dr, dc in directions:
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < n and 0 <= nc < n:
-                if grid[nr][nc] == '#':  # Obstacle
-                    continue
-
-                # Determine step cost based on tile type
-                if grid[nr][nc] in ['S', 'T']:  # Start or Treasure
-                    step_cost = 0
-                elif grid[nr][nc] == 'X':  # Trap
-                    step_cost = 5
-                else:  # Regular empty tile
-                    step_cost = 1
-
-                new_cost = cost_so_far[current] + step_cost
-                if (nr, nc) not in cost_so_far or new_cost < cost_so_far[(nr, nc)]:
-                    visited.add((nr, nc))
-                    cost_so_far[(nr, nc)] = new_cost
-                    parent[(nr, nc)] = current
-                    f_cost = new_cost + heuristic((nr, nc))  # f = g + h
-                    pq.append((f_cost, (nr, nc)))
+
+        # Explore open neighbors (Up, Right, Left, Down)
+        for neighbor in neighbor_idx[neighbor_ptr[current]:neighbor_ptr[current + 1]]:
+            new_cost = cost_so_far[current] + step_cost[neighbor]
+            if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                cost_so_far[neighbor] = new_cost
+                parent[neighbor] = current
+                f_cost = new_cost + heuristic(neighbor)  # f = g + h
+                pq.push(neighbor, f_cost)
 
     avg_heuristic = total_heuristic / heuristic_count if heuristic_count > 0 else 0.0
-    return None, expanded_nodes, avg_heuristic  # No path found
\ No newline at end of file
+    return None, expanded_nodes, avg_heuristic  # No path found
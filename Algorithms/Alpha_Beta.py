@@ -1,53 +1,54 @@
-import copy
 import random
 import math
+import time
+from Algorithms.game_state import GameState
+from Algorithms.search_context import SearchContext
+from Algorithms.transposition import ZobristHasher, TranspositionTable, EXACT, LOWER, UPPER
 
-#counter for nodes expanded
-nodes_expanded = 0
-
-#counter for pruned branches
-pruned_branches = 0
-
-#configurable search depth
+#default search depth for searches started without a context (the GUI depth buttons change it)
 MAX_DEPTH = 2
 
-def Alpha_Beta(grid, start, end):
-    global nodes_expanded, pruned_branches
-    nodes_expanded = 0
-    pruned_branches = 0
+def Alpha_Beta(grid, start, end, context=None):
+    #counters, depth and time budget live on the context so concurrent searches stay independent
+    if context is None:
+        context = SearchContext(max_depth=MAX_DEPTH)
+    context.begin_search(grid)
 
     #place opponent
-    opponent_start = place_opponent_strategic(grid, start, end)
+    opponent_start = place_opponent_strategic(grid, start, end, context.rng)
+
+    #one transposition table per game, kept across turns. Only nodes with two or more plies
+    #left probe it, so shallower searches skip the hashing altogether
+    hasher = None
+    context.transposition_table = None
+    if context.tt_size and context.max_depth >= 3:
+        if context.zobrist_hasher is None:
+            context.zobrist_hasher = ZobristHasher(len(grid))
+        hasher = context.zobrist_hasher
+        context.transposition_table = TranspositionTable(context.tt_size)
 
     #initialize game state
-    initial_state = {
-        'agent_a_pos': start,
-        'agent_b_pos': opponent_start,
-        'treasure_pos': end,
-        'grid': grid,
-        'agent_a_path': [start],
-        'treasure_collected': False
-    }
+    initial_state = GameState(grid, start, opponent_start, end, hasher=hasher)
 
     #run the game simulation using minimax
-    final_state = simulate_game_with_minimax(initial_state, MAX_DEPTH)
+    final_state = simulate_game_with_minimax(initial_state, context)
 
     #return results
-    path = final_state['agent_a_path']
+    path = final_state.agent_a_path
 
     #make sure to reach treasure
-    if not final_state['treasure_collected'] and path[-1] != end:
+    if not final_state.treasure_collected and path[-1] != end:
         #add path to treasure if minimax failed
         assert isinstance(path, list)
         path.extend(get_simple_path(path[-1], end, grid))
 
     #return negative distance as heuristic
-    if final_state['treasure_collected']:
+    if final_state.treasure_collected:
         heuristic_value = -len(path)
     else:
         heuristic_value = -manhattan_distance(path[-1], end) - len(path)
 
-    return path, nodes_expanded, heuristic_value, pruned_branches
+    return path, context.nodes_expanded, heuristic_value, context.pruned_branches
 
 
 def get_simple_path(start, end, grid):
@@ -109,21 +110,26 @@ def bfs_fallback(start, end, grid):
     return []  #no path found
 
 
-def simulate_game_with_minimax(initial_state, max_depth):
-    state = dict(initial_state)
-    state['agent_a_path'] = copy.deepcopy(initial_state['agent_a_path'])
+def simulate_game_with_minimax(initial_state, context):
+    #the real game is played on initial_state itself; the search only makes/unmakes on top of it
+    state = initial_state
 
     max_turns = 50
     turn = 0
-    path_set = set(state['agent_a_path'])
+    path_set = set(state.agent_a_path)
     consecutive_no_progress = 0
     recent_positions = []  #track recent positions to detect loops
 
-    while turn < max_turns and not state['treasure_collected']:
-        last_pos = state['agent_a_path'][-1] if state['agent_a_path'] else None
+    while turn < max_turns and not state.treasure_collected:
+        last_pos = state.agent_a_path[-1] if state.agent_a_path else None
 
         #agent A turn - use minimax
-        best_move, _ = minimax_decision(state, max_depth, True, path_set)
+        if context.transposition_table is not None:
+            context.transposition_table.new_turn()
+        if context.move_time_ms is not None:
+            best_move, _ = iterative_deepening_decision(state, context, True, path_set)
+        else:
+            best_move, _ = minimax_decision(state, context, True, path_set)
 
         if best_move is None:
             best_move = get_best_greedy_move(state, path_set)
@@ -138,8 +144,8 @@ def simulate_game_with_minimax(initial_state, max_depth):
             break
 
         #check for progress
-        current_dist = manhattan_distance(state['agent_a_pos'], state['treasure_pos'])
-        new_dist = manhattan_distance(best_move, state['treasure_pos'])
+        current_dist = manhattan_distance(state.agent_a_pos, state.treasure_pos)
+        new_dist = manhattan_distance(best_move, state.treasure_pos)
 
         if new_dist >= current_dist and best_move in path_set:
             consecutive_no_progress += 1
@@ -157,9 +163,7 @@ def simulate_game_with_minimax(initial_state, max_depth):
             break
 
         #apply move
-        state['agent_a_pos'] = best_move
-        assert isinstance(state['agent_a_path'], list)
-        state['agent_a_path'].append(best_move)
+        state.make_move(best_move, True)
         path_set.add(best_move)
 
         #track recent positions to detect loops
@@ -175,15 +179,13 @@ def simulate_game_with_minimax(initial_state, max_depth):
                 break
 
         #check treasure
-        if best_move == state['treasure_pos']:
-            assert isinstance(state, dict)
-            state['treasure_collected'] = True
+        if state.treasure_collected:
             break
 
         #agent B move
         opp_move = get_opponent_move(state)
         if opp_move:
-            state['agent_b_pos'] = opp_move
+            state.make_move(opp_move, False)
 
         turn += 1
 
@@ -192,8 +194,8 @@ def simulate_game_with_minimax(initial_state, max_depth):
 
 
 def get_best_greedy_move(state, visited_set):
-    legal = get_legal_moves_simple(state['grid'], state['agent_a_pos'])
-    goal = state['treasure_pos']
+    legal = get_legal_moves_simple(state.grid, state.agent_a_pos)
+    goal = state.treasure_pos
 
     #prefer unvisited
     unvisited = [m for m in legal if m not in visited_set or m == goal]
@@ -207,16 +209,82 @@ def get_best_greedy_move(state, visited_set):
 
     return None
 
+def iterative_deepening_decision(state, context, is_maximizing, visited_set):
+    # Search depth 1, 2, ... up to context.max_depth until the per-move budget runs out.
+    # Each iteration is ordered by the previous one (principal variation, killers, history),
+    # and the move of the deepest iteration that finished is played
+    max_depth = context.max_depth
+    search_deadline = context.deadline
+    move_deadline = time.perf_counter() + context.move_time_ms / 1000.0
+    context.deadline = move_deadline if search_deadline is None else min(search_deadline, move_deadline)
+
+    context.move_ordering = True
+    context.pv_moves = {}
+    context.killer_moves = {}
+    context.iteration_nodes = []
+
+    best_move, best_value, depth_reached = None, None, 0
+    for depth in range(1, max_depth + 1):
+        context.max_depth = depth
+        context.pv_table = {}
+        nodes_before = context.nodes_expanded
+
+        move, value = minimax_decision(state, context, is_maximizing, visited_set)
+        context.iteration_nodes.append(context.nodes_expanded - nodes_before)
+
+        # An iteration cut short by the budget is discarded, unless there is nothing better yet
+        if context.out_of_time() and best_move is not None:
+            break
+
+        best_move, best_value, depth_reached = move, value, depth
+        context.pv_moves = dict(enumerate(context.pv_table.get(0, [])))
+
+        if context.out_of_time():
+            break
+
+    context.max_depth = max_depth
+    context.deadline = search_deadline
+    context.move_ordering = False
+    context.depths_reached.append(depth_reached)
+    context.iteration_nodes_per_move.append(context.iteration_nodes)
+
+    return best_move, best_value
+
+
+def order_moves(context, moves, ply, is_maximizing):
+    # Previous principal variation first, then killer moves, then by history score
+    pv_move = context.pv_moves.get(ply)
+    killers = context.killer_moves.get(ply, ())
+    history = context.history
+
+    def priority(move):
+        if move == pv_move:
+            return (0, 0)
+        if move in killers:
+            return (1, killers.index(move))
+        return (2, -history.get((is_maximizing, move), 0))
+
+    return sorted(moves, key=priority)
+
+
+def record_cutoff(context, move, ply, remaining, is_maximizing):
+    killers = context.killer_moves.setdefault(ply, [])
+    if move not in killers:
+        killers.insert(0, move)
+        del killers[2:]
+    key = (is_maximizing, move)
+    context.history[key] = context.history.get(key, 0) + remaining * remaining
+
 '''
 Updated to include alpha-beta pruning
 '''
-def minimax_decision(state, max_depth, is_maximizing, visited_set):
+def minimax_decision(state, context, is_maximizing, visited_set):
     alpha = -math.inf
     beta = math.inf
 
-    legal_moves = get_legal_moves_simple(
-        state['grid'],
-        state['agent_a_pos'] if is_maximizing else state['agent_b_pos']
+    legal_moves = get_legal_moves_cached(
+        context,
+        state.agent_a_pos if is_maximizing else state.agent_b_pos
     )
 
     if not legal_moves:
@@ -224,31 +292,37 @@ def minimax_decision(state, max_depth, is_maximizing, visited_set):
 
     # Root-only prioritization for A
     if is_maximizing:
-        treasure = state['treasure_pos']
+        treasure = state.treasure_pos
         unvisited = [m for m in legal_moves if m not in visited_set or m == treasure]
         if unvisited:
             legal_moves = unvisited
 
     # Root-only anti-backtracking
-    last_pos = state['agent_a_path'][-1] if state.get('agent_a_path') else None
+    last_pos = state.agent_a_path[-1] if state.agent_a_path else None
     if is_maximizing and last_pos and len(legal_moves) > 1 and last_pos in legal_moves:
         legal_moves = [m for m in legal_moves if m != last_pos]
 
+    if context.move_ordering:
+        legal_moves = order_moves(context, legal_moves, 0, is_maximizing)
+
     best_move = None
 
     if is_maximizing:
         best_value = -math.inf
         for move in legal_moves:
-            new_state = apply_move(state, move, True)
-            value = minimax_value(new_state, 1, max_depth, False, alpha, beta)
+            undo = state.make_move(move, True)
+            value = minimax_value(state, 1, context, False, alpha, beta)
+            state.unmake_move(undo)
 
             # Add your heuristic bonus
-            dist_bonus = -manhattan_distance(move, state['treasure_pos'])
+            dist_bonus = -manhattan_distance(move, state.treasure_pos)
             value += dist_bonus * 0.5
 
             if value > best_value:
                 best_value = value
                 best_move = move
+                if context.move_ordering:
+                    context.pv_table[0] = [move] + context.pv_table.get(1, [])
 
             alpha = max(alpha, best_value)
             if alpha >= beta:
@@ -256,12 +330,15 @@ def minimax_decision(state, max_depth, is_maximizing, visited_set):
     else:
         best_value = math.inf
         for move in legal_moves:
-            new_state = apply_move(state, move, False)
-            value = minimax_value(new_state, 1, max_depth, True, alpha, beta)
+            undo = state.make_move(move, False)
+            value = minimax_value(state, 1, context, True, alpha, beta)
+            state.unmake_move(undo)
 
             if value < best_value:
                 best_value = value
                 best_move = move
+                if context.move_ordering:
+                    context.pv_table[0] = [move] + context.pv_table.get(1, [])
 
             beta = min(beta, best_value)
             if beta <= alpha:
@@ -272,20 +349,40 @@ def minimax_decision(state, max_depth, is_maximizing, visited_set):
 '''
 Updated to include alpha-beta pruning
 '''
-def minimax_value(state, depth, max_depth, is_maximizing, alpha, beta):
-    global nodes_expanded, pruned_branches
-    nodes_expanded += 1
+def minimax_value(state, depth, context, is_maximizing, alpha, beta):
+    context.nodes_expanded += 1
+    if context.move_ordering:
+        context.pv_table[depth] = []
 
-    # Terminal or depth reached
-    if state['treasure_collected']:
+    # Terminal or depth reached (running out of time budget counts as reaching depth)
+    if state.treasure_collected:
         return 10000
-    if depth >= max_depth:
+    if depth >= context.max_depth or context.out_of_time():
         return evaluate_state(state)
 
+    # Transposition table: reuse a stored result if it was searched at least this deep
+    # and its bound already decides this window. Nodes right above the leaves are cheaper
+    # to search than to look up, so they skip the table
+    remaining = context.max_depth - depth
+    table = context.transposition_table if remaining >= 2 else None
+    if table is not None:
+        key = state.zobrist_key(is_maximizing)
+        context.tt_probes += 1
+        entry = table.probe(key)
+        if entry is not None:
+            context.tt_hits += 1
+            if entry[1] >= remaining:
+                stored_value, flag = entry[2], entry[3]
+                if (flag == EXACT or (flag == LOWER and stored_value >= beta)
+                        or (flag == UPPER and stored_value <= alpha)):
+                    context.tt_cutoffs += 1
+                    return stored_value
+        alpha_orig, beta_orig = alpha, beta
+
     # Determine whose legal moves
-    legal_moves = get_legal_moves_simple(
-        state['grid'],
-        state['agent_a_pos'] if is_maximizing else state['agent_b_pos']
+    legal_moves = get_legal_moves_cached(
+        context,
+        state.agent_a_pos if is_maximizing else state.agent_b_pos
     )
 
     if not legal_moves:
@@ -293,52 +390,85 @@ def minimax_value(state, depth, max_depth, is_maximizing, alpha, beta):
 
     # Anti-backtracking for agent A (deeper levels)
     if is_maximizing:
-        if state.get('agent_a_path') and len(state['agent_a_path']) >= 2:
-            last_pos = state['agent_a_path'][-2]
+        if len(state.agent_a_path) >= 2:
+            last_pos = state.agent_a_path[-2]
             if last_pos and len(legal_moves) > 1 and last_pos in legal_moves:
                 legal_moves = [m for m in legal_moves if m != last_pos]
 
+    if context.move_ordering:
+        legal_moves = order_moves(context, legal_moves, depth, is_maximizing)
+
     # Max-player branch (Agent A)
     if is_maximizing:
         max_value = -math.inf
         for move in legal_moves:
-            new_state = apply_move(state, move, True)
-            value = minimax_value(new_state, depth + 1, max_depth, False, alpha, beta)
+            undo = state.make_move(move, True)
+            value = minimax_value(state, depth + 1, context, False, alpha, beta)
+            state.unmake_move(undo)
+
+            if context.move_ordering and value > max_value:
+                context.pv_table[depth] = [move] + context.pv_table.get(depth + 1, [])
 
             max_value = max(max_value, value)
             alpha = max(alpha, max_value)
 
             if alpha >= beta:   # prune
-                pruned_branches += 1
+                context.pruned_branches += 1
+                if context.move_ordering:
+                    record_cutoff(context, move, depth, remaining, True)
                 break
+        if table is not None:
+            store_entry(context, key, remaining, max_value, alpha_orig, beta_orig)
         return max_value
 
     # Min-player branch (Agent B)
     else:
         min_value = math.inf
         for move in legal_moves:
-            new_state = apply_move(state, move, False)
-            value = minimax_value(new_state, depth + 1, max_depth, True, alpha, beta)
+            undo = state.make_move(move, False)
+            value = minimax_value(state, depth + 1, context, True, alpha, beta)
+            state.unmake_move(undo)
+
+            if context.move_ordering and value < min_value:
+                context.pv_table[depth] = [move] + context.pv_table.get(depth + 1, [])
 
             min_value = min(min_value, value)
             beta = min(beta, min_value)
 
             if beta <= alpha:  # prune
-                pruned_branches += 1
+                context.pruned_branches += 1
+                if context.move_ordering:
+                    record_cutoff(context, move, depth, remaining, False)
                 break
+        if table is not None:
+            store_entry(context, key, remaining, min_value, alpha_orig, beta_orig)
         return min_value
 
 
+def store_entry(context, key, remaining, value, alpha_orig, beta_orig):
+    # A subtree cut short by the time budget is not a real result, keep it out of the table
+    if context.out_of_time():
+        return
+
+    if value <= alpha_orig:
+        flag = UPPER
+    elif value >= beta_orig:
+        flag = LOWER
+    else:
+        flag = EXACT
+    context.transposition_table.store(key, remaining, value, flag)
+
+
 
 
 def evaluate_state(state):
-    if state['treasure_collected']:
+    if state.treasure_collected:
         return 10000
 
-    agent_a_pos = state['agent_a_pos']
-    agent_b_pos = state['agent_b_pos']
-    treasure_pos = state['treasure_pos']
-    grid = state['grid']
+    agent_a_pos = state.agent_a_pos
+    agent_b_pos = state.agent_b_pos
+    treasure_pos = state.treasure_pos
+    grid = state.grid
 
     #distances
     dist_a = manhattan_distance(agent_a_pos, treasure_pos)
@@ -350,7 +480,7 @@ def evaluate_state(state):
         trap_penalty = 100
 
     #revisit penalty so it discourage being on square already visited multiple times
-    revisit_count = state['agent_a_path'].count(agent_a_pos) if state.get('agent_a_path') else 0
+    revisit_count = state.visit_count(agent_a_pos)
     revisit_penalty = max(0, revisit_count - 1) * 50
 
     utility = (
@@ -379,41 +509,26 @@ def get_legal_moves_simple(grid, pos):
     return legal_moves
 
 
-def apply_move(state, move, is_agent_a):
-    #create isolated child state so simulation branches dont share the same path list
-    new_state = {
-        'agent_a_pos': state['agent_a_pos'],
-        'agent_b_pos': state['agent_b_pos'],
-        'treasure_pos': state['treasure_pos'],
-        'grid': state['grid'],
-        'agent_a_path': copy.deepcopy(state['agent_a_path']),
-        'treasure_collected': state['treasure_collected']
-    }
-
-    if is_agent_a:
-        new_state['agent_a_pos'] = move
-        #append simulated move to the childs path so eval see realistic paths
-        if isinstance(new_state['agent_a_path'], list):
-            new_state['agent_a_path'].append(move)
-        if move == state['treasure_pos']:
-            new_state['treasure_collected'] = True
-    else:
-        new_state['agent_b_pos'] = move
-
-    return new_state
+def get_legal_moves_cached(context, pos):
+    #legal moves only depend on the grid, so they are cached per position on the context
+    moves = context.legal_moves_cache.get(pos)
+    if moves is None:
+        moves = tuple(get_legal_moves_simple(context.grid, pos))
+        context.legal_moves_cache[pos] = moves
+    return moves
 
 
 def get_opponent_move(state):
-    legal = get_legal_moves_simple(state['grid'], state['agent_b_pos'])
+    legal = get_legal_moves_simple(state.grid, state.agent_b_pos)
 
     if not legal:
         return None
 
-    treasure = state['treasure_pos']
+    treasure = state.treasure_pos
     return min(legal, key=lambda m: manhattan_distance(m, treasure))
 
 
-def place_opponent_strategic(grid, start, end):
+def place_opponent_strategic(grid, start, end, rng=random):
     n = len(grid)
     mid_row = (start[0] + end[0]) // 2
     mid_col = (start[1] + end[1]) // 2
@@ -430,7 +545,7 @@ def place_opponent_strategic(grid, start, end):
 
     #fallback
     for _ in range(20):
-        pos = (random.randint(0, n - 1), random.randint(0, n - 1))
+        pos = (rng.randint(0, n - 1), rng.randint(0, n - 1))
         if (pos != start and pos != end and
                 grid[pos[0]][pos[1]] not in ['#', 'T', 'X', 'S']):
             return pos
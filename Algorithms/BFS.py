@@ -1,34 +1,45 @@
+from collections import deque
+from Algorithms.compiled_grid import compile_grid
+
+
 def BFS(grid, start, end):
-    n = len(grid)
-    directions = [(-1,0), (0,1), (0,-1), (1,0)]  # Up, Right, Left, Down
+    grid = compile_grid(grid)
+    n = grid.n
+    neighbor_ptr, neighbor_idx = grid.neighbor_ptr, grid.neighbor_idx
     expanded_nodes = 0
 
-    queue = [start]
-    visited = set([start])
-    parent = {start: None}  # To reconstruct path
+    # Cells are indexed as r*n+c so visited/parent live in flat preallocated arrays
+    start_idx = grid.index(start)
+    end_idx = grid.index(end)
+
+    queue = deque([start_idx])
+    visited = bytearray(n * n)
+    visited[start_idx] = 1
+    parent = [-1] * (n * n)  # To reconstruct path
 
     while queue:
-        current = queue.pop(0)
+        current = queue.popleft()
         expanded_nodes += 1
 
         # Check if we've reached the goal
-        if current == end:
-            # Reconstruct path
-            path = []
-            while current is not None:
-                path.append(current)
-                current = parent[current]
-            path.reverse()
-            return path, expanded_nodes
-
-        # Explore neighbors
-        r, c = current
-        for dr, dc in directions:
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < n and 0 <= nc < n:  # Within bounds
-                if (grid[nr][nc] != '#') and (nr, nc) not in visited:
-                    visited.add((nr, nc))
-                    parent[(nr, nc)] = (r, c)
-                    queue.append((nr, nc))
-
-    return None, expanded_nodes  # No path found
\ No newline at end of file
+        if current == end_idx:
+            return _reconstruct_path(parent, current, start_idx, n), expanded_nodes
+
+        # Explore open neighbors (Up, Right, Left, Down)
+        for neighbor in neighbor_idx[neighbor_ptr[current]:neighbor_ptr[current + 1]]:
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                parent[neighbor] = current
+                queue.append(neighbor)
+
+    return None, expanded_nodes  # No path found
+
+
+def _reconstruct_path(parent, current, start_idx, n):
+    path = []
+    while current != start_idx:
+        path.append(divmod(current, n))
+        current = parent[current]
+    path.append(divmod(start_idx, n))
+    path.reverse()
+    return path
@@ -1,59 +1,56 @@
-def Greedy_BFS(grid, start, end):
-    n = len(grid)
-    directions = [(-1, 0), (0, 1), (0, -1), (1, 0)]
+from Algorithms.compiled_grid import compile_grid
+from Algorithms.frontier import PriorityFrontier
+
+
+def Greedy_BFS(grid, start, end, frontier_cls=PriorityFrontier):
+    grid = compile_grid(grid)
+    n = grid.n
+    neighbor_ptr, neighbor_idx = grid.neighbor_ptr, grid.neighbor_idx
+    step_cost = grid.step_cost  # 0 for Start/Treasure, 5 for Trap, 1 for empty
     expanded_nodes = 0
     total_heuristic = 0.0
     heuristic_count = 0
 
+    start_idx = grid.index(start)
+    end_idx = grid.index(end)
+    end_r, end_c = end
+
     # manhattan distance heuristic
-    def heuristic(pos):
-        return abs(pos[0] - end[0]) + abs(pos[1] - end[1])
+    def heuristic(idx):
+        r, c = divmod(idx, n)
+        return abs(r - end_r) + abs(c - end_c)
 
-    pq = [(heuristic(start), start)]
-    visited = set([start])
-    parent = {start: None}
-    cost_so_far = {start: 0}  # Track costs for path calculation
+    pq = frontier_cls()
+    pq.push(start_idx, heuristic(start_idx))
+    visited = set([start_idx])
+    parent = {start_idx: None}
+    cost_so_far = {start_idx: 0}  # Track costs for path calculation
 
     while pq:
-        pq.sort()  # smallest h_cost is first
-        current_h, current = pq.pop(0)
+        current_h, current = pq.pop()  # smallest h_cost is first
         expanded_nodes += 1
         total_heuristic += heuristic(current)
         heuristic_count += 1
 
         # check the goal if reached
-        if current == end:
+        if current == end_idx:
             # build path
             path = []
             while current is not None:
-                path.append(current)
+                path.append(grid.position(current))
                 current = parent[current]
             path.reverse()
             avg_heuristic = total_heuristic / heuristic_count if heuristic_count > 0 else 0.0
             return path, expanded_nodes, avg_heuristic
 
-        r, c = current
-        for dr, dc in directions:
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < n and 0 <= nc < n:
-                if grid[nr][nc] == '#':  # Obstacle
-                    continue
-                if (nr, nc) not in visited:
-                    visited.add((nr, nc))
-                    parent[(nr, nc)] = current
-
-                    # Determine step cost based on tile type
-                    if grid[nr][nc] in ['S', 'T']:  # Start or Treasure
-                        step_cost = 0
-                    elif grid[nr][nc] == 'X':  # Trap
-                        step_cost = 5
-                    else:  # Regular empty tile
-                        step_cost = 1
-
-                    cost_so_far[(nr, nc)] = cost_so_far[current] + step_cost
-                    h_cost = heuristic((nr, nc))  # Only heuristic, no g cost
-                    pq.append((h_cost, (nr, nc)))
+        # explore open neighbors (Up, Right, Left, Down)
+        for neighbor in neighbor_idx[neighbor_ptr[current]:neighbor_ptr[current + 1]]:
+            if neighbor not in visited:
+                visited.add(neighbor)
+                parent[neighbor] = current
+                cost_so_far[neighbor] = cost_so_far[current] + step_cost[neighbor]
+                h_cost = heuristic(neighbor)  # Only heuristic, no g cost
+                pq.push(neighbor, h_cost)
 
     avg_heuristic = total_heuristic / heuristic_count if heuristic_count > 0 else 0.0
     return None, expanded_nodes, avg_heuristic  # No path found
-
@@ -1,49 +1,42 @@
-import copy
 import random
 import math
+from Algorithms.game_state import GameState
+from Algorithms.search_context import SearchContext
 
-#counter for nodes expanded
-nodes_expanded = 0
-
-#configurable search depth
+#default search depth for searches started without a context (the GUI depth buttons change it)
 MAX_DEPTH = 2
 
-def MiniMax(grid, start, end):
-    global nodes_expanded
-    nodes_expanded = 0
+def MiniMax(grid, start, end, context=None):
+    #counters, depth and time budget live on the context so concurrent searches stay independent
+    if context is None:
+        context = SearchContext(max_depth=MAX_DEPTH)
+    context.begin_search(grid)
 
     #place opponent
-    opponent_start = place_opponent_strategic(grid, start, end)
+    opponent_start = place_opponent_strategic(grid, start, end, context.rng)
 
     #initialize game state
-    initial_state = {
-        'agent_a_pos': start,
-        'agent_b_pos': opponent_start,
-        'treasure_pos': end,
-        'grid': grid,
-        'agent_a_path': [start],
-        'treasure_collected': False
-    }
+    initial_state = GameState(grid, start, opponent_start, end)
 
     #run the game simulation using minimax
-    final_state = simulate_game_with_minimax(initial_state, MAX_DEPTH)
+    final_state = simulate_game_with_minimax(initial_state, context)
 
     #return results
-    path = final_state['agent_a_path']
+    path = final_state.agent_a_path
 
     #make sure to reach treasure
-    if not final_state['treasure_collected'] and path[-1] != end:
+    if not final_state.treasure_collected and path[-1] != end:
         #add path to treasure if minimax failed
         assert isinstance(path, list)
         path.extend(get_simple_path(path[-1], end, grid))
 
     #return negative distance as heuristic
-    if final_state['treasure_collected']:
+    if final_state.treasure_collected:
         heuristic_value = -len(path)
     else:
         heuristic_value = -manhattan_distance(path[-1], end) - len(path)
 
-    return path, nodes_expanded, heuristic_value
+    return path, context.nodes_expanded, heuristic_value
 
 
 def get_simple_path(start, end, grid):
@@ -105,21 +98,21 @@ def bfs_fallback(start, end, grid):
     return []  #no path found
 
 
-def simulate_game_with_minimax(initial_state, max_depth):
-    state = dict(initial_state)
-    state['agent_a_path'] = copy.deepcopy(initial_state['agent_a_path'])
+def simulate_game_with_minimax(initial_state, context):
+    #the real game is played on initial_state itself; the search only makes/unmakes on top of it
+    state = initial_state
 
     max_turns = 50
     turn = 0
-    path_set = set(state['agent_a_path'])
+    path_set = set(state.agent_a_path)
     consecutive_no_progress = 0
     recent_positions = []  #track recent positions to detect loops
 
-    while turn < max_turns and not state['treasure_collected']:
-        last_pos = state['agent_a_path'][-1] if state['agent_a_path'] else None
+    while turn < max_turns and not state.treasure_collected:
+        last_pos = state.agent_a_path[-1] if state.agent_a_path else None
 
         #agent A turn - use minimax
-        best_move, _ = minimax_decision(state, max_depth, True, path_set)
+        best_move, _ = minimax_decision(state, context, True, path_set)
 
         if best_move is None:
             best_move = get_best_greedy_move(state, path_set)
@@ -134,8 +127,8 @@ def simulate_game_with_minimax(initial_state, max_depth):
             break
 
         #check for progress
-        current_dist = manhattan_distance(state['agent_a_pos'], state['treasure_pos'])
-        new_dist = manhattan_distance(best_move, state['treasure_pos'])
+        current_dist = manhattan_distance(state.agent_a_pos, state.treasure_pos)
+        new_dist = manhattan_distance(best_move, state.treasure_pos)
 
         if new_dist >= current_dist and best_move in path_set:
             consecutive_no_progress += 1
@@ -153,9 +146,7 @@ def simulate_game_with_minimax(initial_state, max_depth):
             break
 
         #apply move
-        state['agent_a_pos'] = best_move
-        assert isinstance(state['agent_a_path'], list)
-        state['agent_a_path'].append(best_move)
+        state.make_move(best_move, True)
         path_set.add(best_move)
 
         #track recent positions to detect loops
@@ -171,15 +162,13 @@ def simulate_game_with_minimax(initial_state, max_depth):
                 break
 
         #check treasure
-        if best_move == state['treasure_pos']:
-            assert isinstance(state, dict)
-            state['treasure_collected'] = True
+        if state.treasure_collected:
             break
 
         #agent B move
         opp_move = get_opponent_move(state)
         if opp_move:
-            state['agent_b_pos'] = opp_move
+            state.make_move(opp_move, False)
 
         turn += 1
 
@@ -188,8 +177,8 @@ def simulate_game_with_minimax(initial_state, max_depth):
 
 
 def get_best_greedy_move(state, visited_set):
-    legal = get_legal_moves_simple(state['grid'], state['agent_a_pos'])
-    goal = state['treasure_pos']
+    legal = get_legal_moves_simple(state.grid, state.agent_a_pos)
+    goal = state.treasure_pos
 
     #prefer unvisited
     unvisited = [m for m in legal if m not in visited_set or m == goal]
@@ -204,22 +193,22 @@ def get_best_greedy_move(state, visited_set):
     return None
 
 
-def minimax_decision(state, max_depth, is_maximizing, visited_set):
-    legal_moves = get_legal_moves_simple(state['grid'],
-                                         state['agent_a_pos'] if is_maximizing else state['agent_b_pos'])
+def minimax_decision(state, context, is_maximizing, visited_set):
+    legal_moves = get_legal_moves_cached(context,
+                                         state.agent_a_pos if is_maximizing else state.agent_b_pos)
 
     if not legal_moves:
         return None, evaluate_state(state)
 
     #agent A prioritize unvisited moves for root
     if is_maximizing:
-        treasure = state['treasure_pos']
+        treasure = state.treasure_pos
         unvisited = [m for m in legal_moves if m not in visited_set or m == treasure]
         if unvisited:
             legal_moves = unvisited
 
     #avoid immediate backtrack at root if possible
-    last_pos = state['agent_a_path'][-1] if state.get('agent_a_path') else None
+    last_pos = state.agent_a_path[-1] if state.agent_a_path else None
     if is_maximizing and last_pos and len(legal_moves) > 1 and last_pos in legal_moves:
         legal_moves = [m for m in legal_moves if m != last_pos]
 
@@ -228,9 +217,10 @@ def minimax_decision(state, max_depth, is_maximizing, visited_set):
     if is_maximizing:
         best_value = -math.inf
         for move in legal_moves:
-            new_state = apply_move(state, move, is_maximizing)
-            value = minimax_value(new_state, 1, max_depth, False)
-            dist_bonus = -manhattan_distance(move, state['treasure_pos'])
+            undo = state.make_move(move, is_maximizing)
+            value = minimax_value(state, 1, context, False)
+            state.unmake_move(undo)
+            dist_bonus = -manhattan_distance(move, state.treasure_pos)
             value += dist_bonus * 0.5
             if value > best_value:
                 best_value = value
@@ -238,8 +228,9 @@ def minimax_decision(state, max_depth, is_maximizing, visited_set):
     else:
         best_value = math.inf
         for move in legal_moves:
-            new_state = apply_move(state, move, is_maximizing)
-            value = minimax_value(new_state, 1, max_depth, True)
+            undo = state.make_move(move, is_maximizing)
+            value = minimax_value(state, 1, context, True)
+            state.unmake_move(undo)
             if value < best_value:
                 best_value = value
                 best_move = move
@@ -248,53 +239,55 @@ def minimax_decision(state, max_depth, is_maximizing, visited_set):
 
 
 
-def minimax_value(state, depth, max_depth, is_maximizing):
-    global nodes_expanded
-    nodes_expanded += 1
+def minimax_value(state, depth, context, is_maximizing):
+    context.nodes_expanded += 1
 
-    if state['treasure_collected']:
+    if state.treasure_collected:
         return 10000
 
-    if depth >= max_depth:
+    #running out of time budget counts as reaching depth
+    if depth >= context.max_depth or context.out_of_time():
         return evaluate_state(state)
 
-    legal_moves = get_legal_moves_simple(state['grid'],
-                                         state['agent_a_pos'] if is_maximizing else state['agent_b_pos'])
+    legal_moves = get_legal_moves_cached(context,
+                                         state.agent_a_pos if is_maximizing else state.agent_b_pos)
 
     if not legal_moves:
         return evaluate_state(state)
 
     #avoid immediate backtrack for deeper search for agent A
     if is_maximizing:
-        last_pos = state['agent_a_path'][-2] if (state.get('agent_a_path') and len(state['agent_a_path']) >= 2) else None
+        last_pos = state.agent_a_path[-2] if len(state.agent_a_path) >= 2 else None
         if last_pos and len(legal_moves) > 1 and last_pos in legal_moves:
             legal_moves = [m for m in legal_moves if m != last_pos]
 
     if is_maximizing:
         max_value = -math.inf
         for move in legal_moves:
-            new_state = apply_move(state, move, is_maximizing)
-            value = minimax_value(new_state, depth + 1, max_depth, False)
+            undo = state.make_move(move, is_maximizing)
+            value = minimax_value(state, depth + 1, context, False)
+            state.unmake_move(undo)
             max_value = max(max_value, value)
         return max_value
     else:
         min_value = math.inf
         for move in legal_moves:
-            new_state = apply_move(state, move, is_maximizing)
-            value = minimax_value(new_state, depth + 1, max_depth, True)
+            undo = state.make_move(move, is_maximizing)
+            value = minimax_value(state, depth + 1, context, True)
+            state.unmake_move(undo)
             min_value = min(min_value, value)
         return min_value
 
 
 
 def evaluate_state(state):
-    if state['treasure_collected']:
+    if state.treasure_collected:
         return 10000
 
-    agent_a_pos = state['agent_a_pos']
-    agent_b_pos = state['agent_b_pos']
-    treasure_pos = state['treasure_pos']
-    grid = state['grid']
+    agent_a_pos = state.agent_a_pos
+    agent_b_pos = state.agent_b_pos
+    treasure_pos = state.treasure_pos
+    grid = state.grid
 
     #distances
     dist_a = manhattan_distance(agent_a_pos, treasure_pos)
@@ -306,7 +299,7 @@ def evaluate_state(state):
         trap_penalty = 100
 
     #revisit penalty so it discourage being on square already visited multiple times
-    revisit_count = state['agent_a_path'].count(agent_a_pos) if state.get('agent_a_path') else 0
+    revisit_count = state.visit_count(agent_a_pos)
     revisit_penalty = max(0, revisit_count - 1) * 50
 
     utility = (
@@ -335,41 +328,26 @@ def get_legal_moves_simple(grid, pos):
     return legal_moves
 
 
-def apply_move(state, move, is_agent_a):
-    #create isolated child state so simulation branches dont share the same path list
-    new_state = {
-        'agent_a_pos': state['agent_a_pos'],
-        'agent_b_pos': state['agent_b_pos'],
-        'treasure_pos': state['treasure_pos'],
-        'grid': state['grid'],
-        'agent_a_path': copy.deepcopy(state['agent_a_path']),
-        'treasure_collected': state['treasure_collected']
-    }
-
-    if is_agent_a:
-        new_state['agent_a_pos'] = move
-        #append simulated move to the childs path so eval see realistic paths
-        if isinstance(new_state['agent_a_path'], list):
-            new_state['agent_a_path'].append(move)
-        if move == state['treasure_pos']:
-            new_state['treasure_collected'] = True
-    else:
-        new_state['agent_b_pos'] = move
-
-    return new_state
+def get_legal_moves_cached(context, pos):
+    #legal moves only depend on the grid, so they are cached per position on the context
+    moves = context.legal_moves_cache.get(pos)
+    if moves is None:
+        moves = tuple(get_legal_moves_simple(context.grid, pos))
+        context.legal_moves_cache[pos] = moves
+    return moves
 
 
 def get_opponent_move(state):
-    legal = get_legal_moves_simple(state['grid'], state['agent_b_pos'])
+    legal = get_legal_moves_simple(state.grid, state.agent_b_pos)
 
     if not legal:
         return None
 
-    treasure = state['treasure_pos']
+    treasure = state.treasure_pos
     return min(legal, key=lambda m: manhattan_distance(m, treasure))
 
 
-def place_opponent_strategic(grid, start, end):
+def place_opponent_strategic(grid, start, end, rng=random):
     n = len(grid)
     mid_row = (start[0] + end[0]) // 2
     mid_col = (start[1] + end[1]) // 2
@@ -386,7 +364,7 @@ def place_opponent_strategic(grid, start, end):
 
     #fallback
     for _ in range(20):
-        pos = (random.randint(0, n - 1), random.randint(0, n - 1))
+        pos = (rng.randint(0, n - 1), rng.randint(0, n - 1))
         if (pos != start and pos != end and
                 grid[pos[0]][pos[1]] not in ['#', 'T', 'X', 'S']):
             return pos
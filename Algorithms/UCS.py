@@ -1,39 +1,40 @@
-def UCS(grid, start, end):
-    n = len(grid)
-    directions = [(-1,0), (0,1), (0,-1), (1,0)]  # Up, Right, Left, Down
+from Algorithms.compiled_grid import compile_grid
+from Algorithms.frontier import PriorityFrontier
+
+
+def UCS(grid, start, end, frontier_cls=PriorityFrontier):
+    grid = compile_grid(grid)
+    neighbor_ptr, neighbor_idx = grid.neighbor_ptr, grid.neighbor_idx
     expanded_nodes = 0
 
-    pq = [(0, start)]  # (total_cost, position)
-    visited = set([start])
-    parent = {start: None}
-    cost_so_far = {start: 0}
+    start_idx = grid.index(start)
+    end_idx = grid.index(end)
+
+    pq = frontier_cls()  # (total_cost, cell index)
+    pq.push(start_idx, 0)
+    parent = {start_idx: None}
+    cost_so_far = {start_idx: 0}
 
     while pq:
-        pq.sort()  # smallest cost comes first
-        current_cost, current = pq.pop(0)
+        current_cost, current = pq.pop()  # smallest cost comes first
         expanded_nodes += 1
 
         # Check if we've reached the goal
-        if current == end:
+        if current == end_idx:
             # Reconstruct path
             path = []
             while current is not None:
-                path.append(current)
+                path.append(grid.position(current))
                 current = parent[current]
             path.reverse()
             return path, expanded_nodes
-        
-        r, c = current
-        for dr, dc in directions:
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < n and 0 <= nc < n:
-                if grid[nr][nc] == '#':  # Obstacle
-                    continue
-                new_cost = current_cost + 1  # cost of each move is 1
-                if (nr, nc) not in cost_so_far or new_cost < cost_so_far[(nr, nc)]:
-                    visited.add((nr, nc))
-                    cost_so_far[(nr, nc)] = new_cost
-                    parent[(nr, nc)] = current
-                    pq.append((new_cost, (nr, nc)))
-
-    return None, expanded_nodes  # No path found
\ No newline at end of file
+
+        # Explore open neighbors (Up, Right, Left, Down)
+        for neighbor in neighbor_idx[neighbor_ptr[current]:neighbor_ptr[current + 1]]:
+            new_cost = current_cost + 1  # cost of each move is 1
+            if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                cost_so_far[neighbor] = new_cost
+                parent[neighbor] = current
+                pq.push(neighbor, new_cost)
+
+    return None, expanded_nodes  # No path found
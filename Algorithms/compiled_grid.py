@@ -0,0 +1,88 @@
+import numpy as np
+
+#tile codes used by the compiled uint8 tile array
+EMPTY = 0
+WALL = 1
+START = 2
+TREASURE = 3
+TRAP = 4
+
+TILE_CODES = {' ': EMPTY, '#': WALL, 'S': START, 'T': TREASURE, 'X': TRAP}
+
+#tile character for each code, TILE_CHARS[tiles] turns a tile array back into characters
+TILE_CHARS = np.array(sorted(TILE_CODES, key=TILE_CODES.get))
+
+#cost of stepping onto a tile, indexed by tile code (walls are never entered)
+STEP_COSTS = np.array([1, 0, 0, 0, 5], dtype=np.uint8)
+
+#neighbor order used by the search algorithms: Up, Right, Left, Down
+DIRECTIONS = [(-1, 0), (0, 1), (0, -1), (1, 0)]
+
+
+class CompiledGrid:
+    #immutable array view of a character grid, built once and shared by every search
+    #cells are indexed as r*n+c. neighbors are stored CSR style: the open neighbors of
+    #cell i are neighbor_idx[neighbor_ptr[i]:neighbor_ptr[i + 1]], in DIRECTIONS order
+
+    def __init__(self, rows, tiles=None):
+        #tiles: the n x n tile code array of rows, when the caller already has it
+        self.rows = rows
+        self.n = len(rows)
+        n = self.n
+
+        if tiles is None:
+            chars = np.array([list(row) for row in rows], dtype='U1').reshape(n, n)
+            tiles = np.zeros((n, n), dtype=np.uint8)
+            for char, code in TILE_CODES.items():
+                if code != EMPTY:
+                    tiles[chars == char] = code
+        else:
+            tiles = np.array(tiles, dtype=np.uint8).reshape(n, n)
+
+        self.tiles = tiles
+        self.costs = STEP_COSTS[tiles]
+        self.open = tiles != WALL
+
+        #candidate neighbor of every cell in each direction, -1 when out of bounds or a wall
+        cell_rows, cell_cols = np.divmod(np.arange(n * n), n)
+        candidates = np.full((n * n, len(DIRECTIONS)), -1, dtype=np.int64)
+        open_flat = self.open.ravel()
+        for d, (dr, dc) in enumerate(DIRECTIONS):
+            nr, nc = cell_rows + dr, cell_cols + dc
+            in_bounds = (nr >= 0) & (nr < n) & (nc >= 0) & (nc < n)
+            neighbor = np.where(in_bounds, nr * n + nc, 0)
+            candidates[:, d] = np.where(in_bounds & open_flat[neighbor], neighbor, -1)
+
+        valid = candidates >= 0
+        self.indptr = np.concatenate(([0], np.cumsum(valid.sum(axis=1))))
+        self.indices = candidates[valid]
+
+        for array in (self.tiles, self.costs, self.open, self.indptr, self.indices):
+            array.flags.writeable = False
+
+        #plain list copies for the scalar hot loops, where numpy element access is slow
+        self.neighbor_ptr = self.indptr.tolist()
+        self.neighbor_idx = self.indices.tolist()
+        self.step_cost = self.costs.ravel().tolist()
+
+    def neighbors(self, idx):
+        return self.neighbor_idx[self.neighbor_ptr[idx]:self.neighbor_ptr[idx + 1]]
+
+    def index(self, pos):
+        return pos[0] * self.n + pos[1]
+
+    def position(self, idx):
+        return divmod(idx, self.n)
+
+    #row access and len() keep the view usable wherever a character grid is expected
+    def __getitem__(self, row):
+        return self.rows[row]
+
+    def __len__(self):
+        return self.n
+
+
+def compile_grid(grid):
+    if isinstance(grid, CompiledGrid):
+        return grid
+    return CompiledGrid(grid)
@@ -0,0 +1,49 @@
+import numpy as np
+
+
+def label_regions(open_mask):
+    #4-connected regions of an n x m boolean mask, as an int array with -1 on closed cells
+    #two open cells share a label exactly when one can be reached from the other
+    #works on horizontal runs of open cells instead of single cells (a row of open cells is
+    #trivially connected), then merges runs that touch vertically with vectorized min-label
+    #hooking and pointer jumping, which settles in a handful of passes
+    rows, cols = open_mask.shape
+
+    #a closed column after every row keeps runs from wrapping into the next row
+    padded = np.zeros((rows, cols + 1), dtype=bool)
+    padded[:, :cols] = open_mask
+    flat = padded.ravel()
+    run_starts = flat & ~np.concatenate(([False], flat[:-1]))
+    run_of = (np.cumsum(run_starts) - 1).reshape(rows, cols + 1)[:, :cols]
+    num_runs = int(np.count_nonzero(run_starts))
+
+    #run pairs joined by a vertical edge, consecutive repeats (same overlap) dropped
+    both = open_mask[:-1] & open_mask[1:]
+    upper = run_of[:-1][both]
+    lower = run_of[1:][both]
+    keep = np.ones(len(upper), dtype=bool)
+    keep[1:] = (upper[1:] != upper[:-1]) | (lower[1:] != lower[:-1])
+    upper, lower = upper[keep], lower[keep]
+
+    parent = np.arange(num_runs)
+    while True:
+        previous = parent.copy()
+
+        #hook: the parent of each end of an edge points at the smaller parent of the other end
+        parent_upper, parent_lower = parent[upper], parent[lower]
+        np.minimum.at(parent, parent_upper, parent_lower)
+        np.minimum.at(parent, parent_lower, parent_upper)
+
+        #shortcut until every run points straight at its root
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+        if np.array_equal(parent, previous):
+            break
+
+    labels = np.full((rows, cols), -1, dtype=np.int64)
+    labels[open_mask] = parent[run_of[open_mask]]
+    return labels
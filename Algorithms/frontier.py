@@ -0,0 +1,126 @@
+import heapq
+
+
+class PriorityFrontier:
+    #binary heap frontier with lazy deletion
+    #pushing an item again with a lower priority supersedes the old entry, which is
+    #skipped when it surfaces. ties are broken on the item itself, which gives the
+    #same pop order the old sorted (priority, position) lists had, so paths are unchanged
+    #the old lists kept superseded duplicates and expanded them again when they came up;
+    #they are skipped here, so where A* re-queued a cell its expanded count and average
+    #heuristic come out lower than the old lists reported
+
+    def __init__(self):
+        self._heap = []
+        self._priority = {}  #item -> priority of its live entry
+
+    def push(self, item, priority):
+        current = self._priority.get(item)
+        if current is not None and current <= priority:
+            return False
+
+        self._priority[item] = priority
+        heapq.heappush(self._heap, (priority, item))
+        return True
+
+    def pop(self):
+        while self._heap:
+            priority, item = heapq.heappop(self._heap)
+
+            #stale entry left behind by a later, cheaper push
+            if self._priority.get(item) != priority:
+                continue
+
+            del self._priority[item]
+            return priority, item
+
+        raise IndexError("pop from empty frontier")
+
+    def __contains__(self, item):
+        return item in self._priority
+
+    def __len__(self):
+        return len(self._priority)
+
+
+class IndexedPriorityFrontier:
+    #binary heap frontier with an item -> heap slot index for in-place decrease-key
+    #never holds more than one entry per item, so memory stays at the live frontier size
+
+    def __init__(self):
+        self._heap = []  #list of [priority, item]
+        self._index = {}  #item -> slot in self._heap
+
+    def push(self, item, priority):
+        slot = self._index.get(item)
+
+        if slot is None:
+            self._heap.append([priority, item])
+            self._index[item] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+            return True
+
+        entry = self._heap[slot]
+        if entry[0] <= priority:
+            return False
+
+        entry[0] = priority
+        self._sift_up(slot)
+        return True
+
+    def pop(self):
+        if not self._heap:
+            raise IndexError("pop from empty frontier")
+
+        top = self._heap[0]
+        last = self._heap.pop()
+        del self._index[top[1]]
+
+        if self._heap:
+            self._heap[0] = last
+            self._index[last[1]] = 0
+            self._sift_down(0)
+
+        return top[0], top[1]
+
+    def _sift_up(self, slot):
+        heap = self._heap
+        entry = heap[slot]
+
+        while slot > 0:
+            parent = (slot - 1) >> 1
+            if heap[parent] <= entry:
+                break
+            heap[slot] = heap[parent]
+            self._index[heap[slot][1]] = slot
+            slot = parent
+
+        heap[slot] = entry
+        self._index[entry[1]] = slot
+
+    def _sift_down(self, slot):
+        heap = self._heap
+        size = len(heap)
+        entry = heap[slot]
+
+        while True:
+            child = 2 * slot + 1
+            if child >= size:
+                break
+            right = child + 1
+            if right < size and heap[right] < heap[child]:
+                child = right
+            if entry <= heap[child]:
+                break
+            heap[slot] = heap[child]
+            self._index[heap[slot][1]] = slot
+            slot = child
+
+        heap[slot] = entry
+        self._index[entry[1]] = slot
+
+    def __contains__(self, item):
+        return item in self._index
+
+    def __len__(self):
+        return len(self._heap)
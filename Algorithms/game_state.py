@@ -0,0 +1,72 @@
+class GameState:
+    #mutable two-agent game state shared by MiniMax/Alpha-Beta
+    #the search walks the tree with make_move/unmake_move on one state instead of copying it,
+    #so expanding a node costs O(1) memory no matter how long agent A's path already is
+
+    __slots__ = ('agent_a_pos', 'agent_b_pos', 'treasure_pos', 'grid',
+                 'agent_a_path', 'visit_counts', 'treasure_collected',
+                 'hasher', 'position_key', 'visit_key')
+
+    def __init__(self, grid, agent_a_pos, agent_b_pos, treasure_pos, hasher=None):
+        self.grid = grid
+        self.agent_a_pos = agent_a_pos
+        self.agent_b_pos = agent_b_pos
+        self.treasure_pos = treasure_pos
+        self.agent_a_path = [agent_a_pos]
+        self.visit_counts = {agent_a_pos: 1}  #position -> times it appears in agent_a_path
+        self.treasure_collected = False
+
+        #optional ZobristHasher, both key parts are then kept up to date by make/unmake
+        self.hasher = hasher
+        self.position_key = 0
+        self.visit_key = 0
+        if hasher is not None:
+            self.position_key = (hasher.a_keys[agent_a_pos] ^ hasher.b_keys[agent_b_pos]
+                                 ^ hasher.previous_keys[None])
+            self.visit_key = hasher.visit_keys[agent_a_pos]
+
+    def make_move(self, move, is_agent_a):
+        #apply a move and return what unmake_move needs to undo it
+        if is_agent_a:
+            undo = (True, self.agent_a_pos, self.treasure_collected, self.position_key, self.visit_key)
+            hasher = self.hasher
+            if hasher is not None:
+                path = self.agent_a_path
+                old_previous = path[-2] if len(path) >= 2 else None
+                self.position_key ^= (hasher.a_keys[self.agent_a_pos] ^ hasher.a_keys[move]
+                                      ^ hasher.previous_keys[old_previous] ^ hasher.previous_keys[self.agent_a_pos])
+                self.visit_key = (self.visit_key + hasher.visit_keys[move]) & hasher.MASK
+            self.agent_a_pos = move
+            self.agent_a_path.append(move)
+            self.visit_counts[move] = self.visit_counts.get(move, 0) + 1
+            if move == self.treasure_pos:
+                self.treasure_collected = True
+        else:
+            undo = (False, self.agent_b_pos, self.treasure_collected, self.position_key, self.visit_key)
+            if self.hasher is not None:
+                self.position_key ^= self.hasher.b_keys[self.agent_b_pos] ^ self.hasher.b_keys[move]
+            self.agent_b_pos = move
+        return undo
+
+    def unmake_move(self, undo):
+        is_agent_a, previous_pos, treasure_collected, position_key, visit_key = undo
+        if is_agent_a:
+            move = self.agent_a_path.pop()
+            count = self.visit_counts[move] - 1
+            if count:
+                self.visit_counts[move] = count
+            else:
+                del self.visit_counts[move]
+            self.agent_a_pos = previous_pos
+        else:
+            self.agent_b_pos = previous_pos
+        self.treasure_collected = treasure_collected
+        self.position_key = position_key
+        self.visit_key = visit_key
+
+    def visit_count(self, pos):
+        return self.visit_counts.get(pos, 0)
+
+    def zobrist_key(self, is_agent_a_to_move):
+        key = self.position_key ^ self.visit_key
+        return key if is_agent_a_to_move else key ^ self.hasher.side_key
@@ -0,0 +1,88 @@
+import numpy as np
+from Algorithms.compiled_grid import compile_grid
+from Algorithms.multi_target import distance_field
+
+
+class Landmarks:
+    #ALT (A*, landmarks, triangle inequality) lower bounds for A* on one compiled grid
+    #holds the true-cost distance from each of k landmarks to every cell. a step costs the tile
+    #it enters, so walking a path backwards costs cost(start) - cost(end) more, and with
+    #d = distance from a landmark L both of these bound the cost from x to the goal t:
+    #    d(L, t) - d(L, x)                          (L -> x -> t is no shorter than L -> t)
+    #    d(L, x) - d(L, t) - cost(x) + cost(t)      (the same through the reversed paths)
+    #the heuristic is the largest of these over all landmarks and A_Star's own Manhattan
+    #distance. the landmark bounds never overestimate; Manhattan only can through zero-cost
+    #start/treasure tiles, as it already does in plain A*. taking the max keeps ALT mode at least
+    #as informed as Manhattan where the landmarks are no help (open stretches between them)
+
+    def __init__(self, grid, positions, distances, expanded_nodes):
+        self.grid = grid
+        self.positions = positions
+        self.distances = distances  #k x n*n float array, inf where a landmark cannot reach
+        self.expanded_nodes = expanded_nodes  #spent by the precomputation
+
+        #plain list copies for the per-node heuristic, where numpy element access is slow
+        self._distance_lists = [row.tolist() for row in distances]
+
+    @classmethod
+    def select(cls, grid, k, first=None):
+        #farthest-point selection: each landmark is the cell farthest (by true cost) from the
+        #landmarks picked so far, starting with the cell farthest from first (default: the first
+        #open cell). only cells reachable from first are candidates
+        grid = compile_grid(grid)
+        n = grid.n
+        if first is None:
+            first = grid.position(int(np.flatnonzero(grid.open)[0]))
+
+        field, expanded_nodes = distance_field(grid, first)
+        nearest = field.ravel()  #distance from each cell to its closest landmark so far
+        reachable = np.isfinite(nearest)
+
+        positions = []
+        distances = np.empty((k, n * n))
+        for i in range(k):
+            candidate = np.where(reachable, nearest, -1.0)
+            idx = int(np.argmax(candidate))
+            if candidate[idx] <= 0 and positions:
+                distances = distances[:i]  #fewer reachable cells than landmarks
+                break
+
+            position = grid.position(idx)
+            field, expanded = distance_field(grid, position)
+            expanded_nodes += expanded
+            positions.append(position)
+            distances[i] = field.ravel()
+            nearest = np.minimum(nearest, distances[i]) if i else distances[i].copy()
+
+        return cls(grid, positions, distances, expanded_nodes)
+
+    def heuristic(self, end):
+        #the ALT bound toward end as a function of a cell index
+        end_idx = self.grid.index(end)
+        step_cost = self.grid.step_cost
+        end_cost = step_cost[end_idx]
+        inf = float('inf')
+
+        #landmarks that cannot reach end say nothing about it
+        toward_end = [(distance, distance[end_idx]) for distance in self._distance_lists
+                      if distance[end_idx] != inf]
+
+        n = self.grid.n
+        end_r, end_c = divmod(end_idx, n)
+
+        #Manhattan distance to end, then any landmark that does better
+        def heuristic(idx):
+            r, c = divmod(idx, n)
+            best = abs(r - end_r) + abs(c - end_c)
+            for distance, to_end in toward_end:
+                to_cell = distance[idx]
+                if to_cell == inf:
+                    continue
+                bound = to_end - to_cell
+                if bound < to_cell - to_end - step_cost[idx] + end_cost:
+                    bound = to_cell - to_end - step_cost[idx] + end_cost
+                if bound > best:
+                    best = bound
+            return best
+
+        return heuristic
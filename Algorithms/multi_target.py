@@ -0,0 +1,177 @@
+from collections import deque
+import numpy as np
+from Algorithms.compiled_grid import compile_grid
+from Algorithms.frontier import PriorityFrontier
+
+
+def multi_target_sweep(grid, start, targets, weighted=True):
+    #one search from start that stops once every reachable target is settled
+    #weighted uses Dijkstra over the tile step costs, otherwise a plain BFS (unit costs)
+    #returns ({target: cost}, parent array, expanded nodes); unreachable targets are left out
+    grid = compile_grid(grid)
+    n = grid.n
+    neighbor_ptr, neighbor_idx = grid.neighbor_ptr, grid.neighbor_idx
+    step_cost = grid.step_cost
+
+    start_idx = grid.index(start)
+    pending = {grid.index(t) for t in targets}
+    distances = {}
+    parent = [-1] * (n * n)
+    expanded_nodes = 0
+
+    def settle(idx, cost):
+        if idx in pending:
+            pending.discard(idx)
+            distances[grid.position(idx)] = cost
+
+    if weighted:
+        cost_so_far = {start_idx: 0}
+        pq = PriorityFrontier()
+        pq.push(start_idx, 0)
+
+        while pq and pending:
+            current_cost, current = pq.pop()
+            expanded_nodes += 1
+            settle(current, current_cost)
+
+            for neighbor in neighbor_idx[neighbor_ptr[current]:neighbor_ptr[current + 1]]:
+                new_cost = current_cost + step_cost[neighbor]
+                if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                    cost_so_far[neighbor] = new_cost
+                    parent[neighbor] = current
+                    pq.push(neighbor, new_cost)
+    else:
+        depth = [-1] * (n * n)
+        depth[start_idx] = 0
+        queue = deque([start_idx])
+
+        while queue and pending:
+            current = queue.popleft()
+            expanded_nodes += 1
+            settle(current, depth[current])
+
+            for neighbor in neighbor_idx[neighbor_ptr[current]:neighbor_ptr[current + 1]]:
+                if depth[neighbor] < 0:
+                    depth[neighbor] = depth[current] + 1
+                    parent[neighbor] = current
+                    queue.append(neighbor)
+
+    return distances, parent, expanded_nodes
+
+
+def sweep_path(grid, parent, start, target):
+    #walk the parent array of a sweep back from target to start
+    grid = compile_grid(grid)
+    start_idx = grid.index(start)
+    current = grid.index(target)
+
+    path = []
+    while current != start_idx:
+        path.append(grid.position(current))
+        current = parent[current]
+    path.append(start)
+    path.reverse()
+    return path
+
+
+def distance_field(grid, start, weighted=True, step_cost=None):
+    #full sweep from start: cost to every cell as an n x n float array, inf where unreachable
+    #weighted uses Dijkstra over the tile step costs, otherwise a plain BFS (unit costs)
+    #step_cost replaces the grid's per-cell costs, for callers that only know some of the tiles
+    #returns (field, expanded nodes)
+    grid = compile_grid(grid)
+    n = grid.n
+    neighbor_ptr, neighbor_idx = grid.neighbor_ptr, grid.neighbor_idx
+    if step_cost is None:
+        step_cost = grid.step_cost
+
+    start_idx = grid.index(start)
+    distance = [-1] * (n * n)
+    distance[start_idx] = 0
+    expanded_nodes = 0
+
+    if weighted:
+        pq = PriorityFrontier()
+        pq.push(start_idx, 0)
+        settled = bytearray(n * n)
+
+        while pq:
+            current_cost, current = pq.pop()
+            settled[current] = 1
+            expanded_nodes += 1
+
+            for neighbor in neighbor_idx[neighbor_ptr[current]:neighbor_ptr[current + 1]]:
+                if settled[neighbor]:
+                    continue
+                new_cost = current_cost + step_cost[neighbor]
+                if distance[neighbor] < 0 or new_cost < distance[neighbor]:
+                    distance[neighbor] = new_cost
+                    pq.push(neighbor, new_cost)
+    else:
+        queue = deque([start_idx])
+
+        while queue:
+            current = queue.popleft()
+            expanded_nodes += 1
+
+            for neighbor in neighbor_idx[neighbor_ptr[current]:neighbor_ptr[current + 1]]:
+                if distance[neighbor] < 0:
+                    distance[neighbor] = distance[current] + 1
+                    queue.append(neighbor)
+
+    field = np.array(distance, dtype=float).reshape(n, n)
+    field[field < 0] = np.inf
+    return field, expanded_nodes
+
+
+def treasure_field(grid, target):
+    #reverse Dijkstra from target over the tile step costs: the cost of reaching target from
+    #every cell, and the first step on an optimal path from there
+    #returns (distance list, -1 where unreachable, next hop list, -1 at target and unreachable,
+    #expanded nodes); field_path walks it from any start in O(path length)
+    grid = compile_grid(grid)
+    n = grid.n
+    neighbor_ptr, neighbor_idx = grid.neighbor_ptr, grid.neighbor_idx
+    step_cost = grid.step_cost
+
+    target_idx = grid.index(target)
+    distance = [-1] * (n * n)
+    distance[target_idx] = 0
+    next_hop = [-1] * (n * n)
+    settled = bytearray(n * n)
+    expanded_nodes = 0
+
+    pq = PriorityFrontier()
+    pq.push(target_idx, 0)
+
+    while pq:
+        current_cost, current = pq.pop()
+        settled[current] = 1
+        expanded_nodes += 1
+
+        #a neighbor reaches target by stepping onto current, which costs current's tile
+        new_cost = current_cost + step_cost[current]
+        for neighbor in neighbor_idx[neighbor_ptr[current]:neighbor_ptr[current + 1]]:
+            if settled[neighbor]:
+                continue
+            if distance[neighbor] < 0 or new_cost < distance[neighbor]:
+                distance[neighbor] = new_cost
+                next_hop[neighbor] = current
+                pq.push(neighbor, new_cost)
+
+    return distance, next_hop, expanded_nodes
+
+
+def field_path(grid, next_hop, start, target):
+    #follow a treasure_field's next hops from start, None when start cannot reach target
+    grid = compile_grid(grid)
+    current = grid.index(start)
+    target_idx = grid.index(target)
+
+    path = [start]
+    while current != target_idx:
+        current = next_hop[current]
+        if current < 0:
+            return None
+        path.append(grid.position(current))
+    return path
@@ -0,0 +1,73 @@
+import random
+import time
+
+
+class SearchContext:
+    #per-search state for MiniMax/Alpha-Beta: depth, counters, time budget and caches
+    #each concurrent search gets its own context, so threads never share counters
+
+    def __init__(self, max_depth=2, time_budget=None, tt_size=1 << 16, move_time_ms=None, rng=None):
+        self.max_depth = max_depth
+
+        #random.Random for the opponent placement fallback, never the global module
+        self.rng = rng if rng is not None else random.Random()
+        self.time_budget = time_budget  #seconds per search, None for no limit
+        self.deadline = None
+
+        #iterative deepening (Alpha-Beta only): with a per-move budget in milliseconds each move
+        #deepens from 1 up to max_depth and plays the deepest iteration that finished in time
+        self.move_time_ms = move_time_ms
+        self.iteration_nodes = []  #nodes expanded by each iteration of the last move
+        self.depths_reached = []  #deepest finished iteration of every move this search
+        self.iteration_nodes_per_move = []  #iteration_nodes of every move this search
+
+        #move ordering state, only used while iterative deepening
+        self.move_ordering = False
+        self.pv_table = {}  #ply -> best line found below that ply in the current iteration
+        self.pv_moves = {}  #ply -> move of the previous iteration's principal variation
+        self.killer_moves = {}  #ply -> up to two moves that recently caused a cutoff there
+        self.history = {}  #(is agent A, move) -> cutoff score
+
+        #counters
+        self.nodes_expanded = 0
+        self.pruned_branches = 0
+
+        #transposition table (Alpha-Beta only), tt_size slots, 0 disables it
+        self.tt_size = tt_size
+        self.transposition_table = None
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.tt_cutoffs = 0  #subtrees answered from the table instead of searched
+
+        #caches, valid for a single grid
+        self.grid = None
+        self.legal_moves_cache = {}
+        self.zobrist_hasher = None
+
+    def begin_search(self, grid):
+        #reset counters and start the clock; caches survive unless the grid changed
+        self.nodes_expanded = 0
+        self.pruned_branches = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.tt_cutoffs = 0
+        self.iteration_nodes = []
+        self.depths_reached = []
+        self.iteration_nodes_per_move = []
+        self.history = {}
+
+        if grid is not self.grid:
+            self.grid = grid
+            self.legal_moves_cache = {}
+            self.zobrist_hasher = None
+
+        if self.time_budget is not None:
+            self.deadline = time.perf_counter() + self.time_budget
+        else:
+            self.deadline = None
+
+    def out_of_time(self):
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+    def tt_hit_rate(self):
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
@@ -0,0 +1,63 @@
+import random
+
+#entry bound types
+EXACT = 0
+LOWER = 1  #search failed high, value is a lower bound
+UPPER = 2  #search failed low, value is an upper bound
+
+
+class ZobristHasher:
+    #random 64-bit keys for everything an Alpha-Beta value depends on: agent A's position,
+    #agent B's position, agent A's previous position (anti-backtracking) and how many times
+    #each cell appears in agent A's path (revisit penalty). positions are xored in; visit counts
+    #are summed mod 2^64 (count * key per cell), so one more visit is a single addition.
+    #GameState keeps both parts up to date incrementally
+
+    MASK = (1 << 64) - 1
+
+    def __init__(self, n, seed=0):
+        rng = random.Random(seed)
+        cells = [(r, c) for r in range(n) for c in range(n)]
+        self.a_keys = {pos: rng.getrandbits(64) for pos in cells}
+        self.b_keys = {pos: rng.getrandbits(64) for pos in cells}
+        self.previous_keys = {pos: rng.getrandbits(64) for pos in cells}
+        self.previous_keys[None] = 0  #no previous position yet
+        self.visit_keys = {pos: rng.getrandbits(64) for pos in cells}
+        self.side_key = rng.getrandbits(64)  #xored in when agent B is to move
+
+
+class TranspositionTable:
+    #fixed number of slots indexed by the low bits of the Zobrist key
+    #replacement: an empty slot, the same position or an entry from an earlier turn is always
+    #overwritten; otherwise the entry searched to the greater remaining depth is kept
+
+    def __init__(self, size=1 << 16):
+        #round up to a power of two so the slot is a mask of the key
+        slots = 1
+        while slots < size:
+            slots <<= 1
+        self.mask = slots - 1
+        self.slots = [None] * slots  #(key, depth, value, flag, generation)
+        self.generation = 0
+        self.stores = 0
+        self.replacements = 0
+
+    def new_turn(self):
+        #entries from earlier turns stay usable but lose their replacement priority
+        self.generation += 1
+
+    def probe(self, key):
+        entry = self.slots[key & self.mask]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, value, flag):
+        slot = key & self.mask
+        entry = self.slots[slot]
+        if entry is not None and entry[0] != key:
+            if entry[4] == self.generation and entry[1] > depth:
+                return
+            self.replacements += 1
+        self.slots[slot] = (key, depth, value, flag, self.generation)
+        self.stores += 1
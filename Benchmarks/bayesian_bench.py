@@ -0,0 +1,72 @@
+import argparse
+import time
+import numpy as np
+from Core.grid_game import Grid
+from Core.sensor_model import SensorModel
+from Core.bayesian_belief import BayesianBeliefMap
+from Core.bayesian_algorithm_runner import BayesianAlgorithmRunner
+from Core.rng_streams import RunStreams
+from Core.run_log import RunLog
+from Algorithms.A_Star import A_Star
+
+#compare the Bayesian targeting utility modes on the same seeded grids and sensor draws
+#usage: python -m Benchmarks.bayesian_bench --sizes 20 40 --grids 20 --noise low
+
+
+def run_mode(size, seed, noise_level, utility_mode):
+    #fresh streams from the same seed give every mode the same grid and the same noise
+    streams = RunStreams(seed)
+    grid_instance = Grid(n=size, rng=streams.grid)
+    grid_instance.generate_grid()
+    sensor_model = SensorModel(noise_level, seed=streams.sensor)
+    runner = BayesianAlgorithmRunner(grid_instance, sensor_model=sensor_model, utility_mode=utility_mode,
+                                     log=RunLog())
+
+    start_time = time.perf_counter()
+    result = runner.run_algorithm_with_beliefs('A*', A_Star)
+    runtime = time.perf_counter() - start_time
+
+    return {
+        'steps': result['total_steps'],
+        'expanded': result['expanded_nodes'],
+        'search_expanded': sum(result['search_expansions']),
+        'max_search': max(result['search_expansions'], default=0),
+        'unreachable': result['unreachable_targets'],
+        'targeting': result['belief_metrics']['targeting_expanded_nodes'],
+        'found': result['treasures_found'] == result['total_treasures'],
+        'runtime': runtime
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Euclidean and path-distance utility for Bayesian targeting")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20, 40])
+    parser.add_argument('--grids', type=int, default=10, help="seeded grids per size")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--noise', choices=list(SensorModel.NOISE_LEVELS), default='low')
+    parser.add_argument('--modes', nargs='+', choices=list(BayesianBeliefMap.UTILITY_MODES),
+                        default=list(BayesianBeliefMap.UTILITY_MODES))
+    args = parser.parse_args()
+
+    #A* expanded counts legs that found a path, all searches adds the failed ones,
+    #max search is the most any single leg expanded, unreachable counts targets the runner
+    #dropped from the region labels without searching
+    print(f"{'size':>6} {'mode':<10} {'steps':>8} {'A* expanded':>12} {'all searches':>13} "
+          f"{'max search':>11} {'unreachable':>12} {'targeting':>10} {'all found':>10} {'runtime':>10}")
+    for size in args.sizes:
+        for utility_mode in args.modes:
+            runs = [run_mode(size, args.seed + i, args.noise, utility_mode) for i in range(args.grids)]
+            steps = np.mean([r['steps'] for r in runs])
+            expanded = np.mean([r['expanded'] for r in runs])
+            search_expanded = np.mean([r['search_expanded'] for r in runs])
+            max_search = max(r['max_search'] for r in runs)
+            unreachable = np.mean([r['unreachable'] for r in runs])
+            targeting = np.mean([r['targeting'] for r in runs])
+            found = sum(r['found'] for r in runs)
+            runtime = np.mean([r['runtime'] for r in runs])
+            print(f"{size:>6} {utility_mode:<10} {steps:>8.1f} {expanded:>12.1f} {search_expanded:>13.1f} "
+                  f"{max_search:>11} {unreachable:>12.1f} {targeting:>10.1f} {found:>6}/{len(runs):<3} {runtime:>9.4f}s")
+
+
+if __name__ == "__main__":
+    main()
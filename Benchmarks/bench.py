@@ -0,0 +1,226 @@
+import argparse
+import csv
+import functools
+import json
+import sys
+import numpy as np
+from Core.grid_game import Grid
+from Core.algorithm_runner import AlgorithmRunner
+from Core.sensor_model import SensorModel
+from Core.rng_streams import RunStreams
+from Core.run_log import RunLog
+from Algorithms import BFS, DFS, UCS, A_Star, Greedy_BFS, MiniMax, Alpha_Beta
+from Algorithms.search_context import SearchContext
+
+#headless batch runs of the search algorithms: no GUI, no matplotlib
+#usage: python -m Benchmarks.bench --sizes 15 50 --grids 20 --algorithms bfs a_star --csv runs.csv
+
+#same keys the GUI uses for its buttons
+ALGORITHMS = {
+    'bfs': ('BFS', BFS.BFS),
+    'dfs': ('DFS', DFS.DFS),
+    'ucs': ('UCS', UCS.UCS),
+    'a_star': ('A*', A_Star.A_Star),
+    'a_star_alt': ('A* (ALT)', A_Star.A_Star),
+    'greedy': ('Greedy BFS', Greedy_BFS.Greedy_BFS),
+    'minimax': ('MiniMax', MiniMax.MiniMax),
+    'alpha_beta': ('Alpha-Beta', Alpha_Beta.Alpha_Beta)
+}
+
+#algorithms that place a random opponent, they get the run's opponent stream through a context
+ADVERSARIAL = {
+    'minimax': MiniMax,
+    'alpha_beta': Alpha_Beta
+}
+
+#algorithms that take the grid's landmarks, which are picked and measured before the run starts
+LANDMARK = {'a_star_alt'}
+
+METRICS = ['runtime', 'expanded_nodes', 'cost', 'total_steps', 'total_scans']
+
+PERCENTILES = [50, 90, 99]
+
+
+def with_context_totals(algorithm_func, context, totals):
+    #the runner calls the search once per treasure and every call resets the context's
+    #counters, so add them up over the run as they come
+    def search(grid, start, end):
+        result = algorithm_func(grid, start, end, context=context)
+        totals['tt_probes'] += context.tt_probes
+        totals['tt_hits'] += context.tt_hits
+        totals['tt_cutoffs'] += context.tt_cutoffs
+        totals['depths_reached'] += context.depths_reached
+        for iteration_nodes in context.iteration_nodes_per_move:
+            totals['iteration_nodes'] += iteration_nodes
+        return result
+    return search
+
+
+def run_job(size, seed, algorithm_key, noise_level='none', move_time_ms=None):
+    #generate one seeded grid and run one algorithm on it, returning a flat record
+    #grid, sensor noise and opponent placement each draw from their own stream of the seed
+    #move_time_ms turns on Alpha-Beta's iterative deepening with that budget per move
+    algorithm_name, algorithm_func = ALGORITHMS[algorithm_key]
+    streams = RunStreams(seed)
+
+    grid_instance = Grid(n=size, rng=streams.grid)
+    grid_instance.generate_grid()
+    sensor_model = SensorModel(noise_level, seed=streams.sensor)
+    #no sinks: the runner's summary would swamp a batch run
+    runner = AlgorithmRunner(grid_instance, sensor_model=sensor_model, log=RunLog())
+
+    totals = None
+    if algorithm_key in ADVERSARIAL:
+        context = SearchContext(max_depth=ADVERSARIAL[algorithm_key].MAX_DEPTH, move_time_ms=move_time_ms,
+                                rng=streams.opponent)
+        totals = {'tt_probes': 0, 'tt_hits': 0, 'tt_cutoffs': 0, 'depths_reached': [], 'iteration_nodes': []}
+        algorithm_func = with_context_totals(algorithm_func, context, totals)
+    if algorithm_key in LANDMARK:
+        algorithm_func = functools.partial(algorithm_func, landmarks=grid_instance.landmarks)
+
+    result = runner.run_algorithm(algorithm_name, algorithm_func)
+
+    record = {
+        'size': size,
+        'seed': seed,
+        'algorithm': algorithm_key,
+        'noise': noise_level
+    }
+    for metric in METRICS:
+        record[metric] = result[metric]
+
+    #adversarial search statistics, None for the other algorithms
+    record['pruned_branches'] = result['pruned_branches']
+    record['tt_hit_rate'] = None
+    record['tt_cutoffs'] = None
+    if totals is not None:
+        record['tt_hit_rate'] = totals['tt_hits'] / totals['tt_probes'] if totals['tt_probes'] else 0.0
+        record['tt_cutoffs'] = totals['tt_cutoffs']
+
+    #iterative deepening, over every move of the run: depth of the deepest finished iteration
+    #and nodes per iteration. None unless --move-time-ms was given (Alpha-Beta only)
+    depths = totals['depths_reached'] if totals is not None else []
+    iteration_nodes = totals['iteration_nodes'] if totals is not None else []
+    record['depth_reached_mean'] = float(np.mean(depths)) if depths else None
+    record['depth_reached_max'] = max(depths) if depths else None
+    record['iteration_nodes_mean'] = float(np.mean(iteration_nodes)) if iteration_nodes else None
+    record['iteration_nodes_max'] = max(iteration_nodes) if iteration_nodes else None
+    return record
+
+
+def build_jobs(sizes, grids, base_seed, algorithm_keys, noise_levels, move_time_ms=None):
+    jobs = []
+    for size in sizes:
+        for i in range(grids):
+            for noise_level in noise_levels:
+                for algorithm_key in algorithm_keys:
+                    jobs.append((size, base_seed + i, algorithm_key, noise_level, move_time_ms))
+    return jobs
+
+
+def summarize(records):
+    #percentiles of every metric per (size, algorithm, noise) group
+    groups = {}
+    for record in records:
+        key = (record['size'], record['algorithm'], record['noise'])
+        groups.setdefault(key, []).append(record)
+
+    summary = []
+    for (size, algorithm_key, noise_level), group in sorted(groups.items()):
+        row = {'size': size, 'algorithm': algorithm_key, 'noise': noise_level, 'runs': len(group)}
+        for metric in METRICS:
+            values = np.array([r[metric] for r in group], dtype=float)
+            row[f'{metric}_mean'] = float(values.mean())
+            for p in PERCENTILES:
+                row[f'{metric}_p{p}'] = float(np.percentile(values, p))
+        summary.append(row)
+    return summary
+
+
+def write_csv(path, rows):
+    if not rows:
+        return
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_json(path, records, summary):
+    with open(path, 'w') as f:
+        json.dump({'runs': records, 'summary': summary}, f, indent=2)
+
+
+def print_summary(summary):
+    print(f"{'size':>6} {'algorithm':<11} {'noise':<7} {'runs':>5} "
+          f"{'runtime p50':>12} {'runtime p90':>12} {'expanded p50':>13} {'cost p50':>9} {'steps p50':>10}")
+    for row in summary:
+        print(f"{row['size']:>6} {row['algorithm']:<11} {row['noise']:<7} {row['runs']:>5} "
+              f"{row['runtime_p50']:>11.4f}s {row['runtime_p90']:>11.4f}s {row['expanded_nodes_p50']:>13.0f} "
+              f"{row['cost_p50']:>9.0f} {row['total_steps_p50']:>10.0f}")
+
+
+def print_alt_reduction(summary):
+    #expanded nodes saved by the ALT heuristic over Manhattan A*, per size and noise level
+    rows = {(row['size'], row['algorithm'], row['noise']): row for row in summary}
+    lines = []
+    for (size, algorithm_key, noise_level), row in sorted(rows.items()):
+        manhattan = rows.get((size, 'a_star', noise_level))
+        if algorithm_key != 'a_star_alt' or manhattan is None or not manhattan['expanded_nodes_mean']:
+            continue
+        reduction = 1.0 - row['expanded_nodes_mean'] / manhattan['expanded_nodes_mean']
+        lines.append(f"{size:>6} {noise_level:<7} {manhattan['expanded_nodes_mean']:>15.1f} "
+                     f"{row['expanded_nodes_mean']:>11.1f} {reduction:>10.1%}")
+    if lines:
+        print(f"\n{'size':>6} {'noise':<7} {'Manhattan mean':>15} {'ALT mean':>11} {'reduction':>10}")
+        print("\n".join(lines))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Headless batch benchmark for the Treasure Hunter search algorithms")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[15, 30, 50])
+    parser.add_argument('--grids', type=int, default=10, help="seeded grids per size")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first grid, later grids count up from it")
+    parser.add_argument('--algorithms', nargs='+', choices=list(ALGORITHMS), default=list(ALGORITHMS))
+    parser.add_argument('--noise', nargs='+', choices=list(SensorModel.NOISE_LEVELS), default=['none'])
+    parser.add_argument('--depth', type=int, help="MiniMax/Alpha-Beta search depth (module default if omitted)")
+    parser.add_argument('--move-time-ms', type=float,
+                        help="Alpha-Beta per-move budget, deepens iteratively up to --depth within it")
+    parser.add_argument('--workers', type=int, default=1, help="worker processes, 0 for one per CPU")
+    parser.add_argument('--chunksize', type=int, help="jobs handed to a worker at a time (default: ~4 chunks per worker)")
+    parser.add_argument('--csv', help="write one row per run to this CSV file")
+    parser.add_argument('--summary-csv', help="write the percentile summary to this CSV file")
+    parser.add_argument('--json', help="write runs and summary to this JSON file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    jobs = build_jobs(args.sizes, args.grids, args.seed, args.algorithms, args.noise, args.move_time_ms)
+
+    if args.workers == 1:
+        if args.depth is not None:
+            MiniMax.MAX_DEPTH = args.depth
+            Alpha_Beta.MAX_DEPTH = args.depth
+        records = [run_job(*job) for job in jobs]
+    else:
+        #imported here since Benchmarks.parallel imports run_job from this module
+        from Benchmarks.parallel import run_jobs_parallel
+        records = run_jobs_parallel(jobs, workers=args.workers or None, chunksize=args.chunksize, depth=args.depth)
+
+    summary = summarize(records)
+    print_summary(summary)
+    print_alt_reduction(summary)
+
+    if args.csv:
+        write_csv(args.csv, records)
+    if args.summary_csv:
+        write_csv(args.summary_csv, summary)
+    if args.json:
+        write_json(args.json, records, summary)
+
+    return records, summary
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,79 @@
+import argparse
+import time
+from Core.grid_game import Grid
+from Algorithms.UCS import UCS
+from Algorithms.A_Star import A_Star
+from Algorithms.Greedy_BFS import Greedy_BFS
+from Algorithms.frontier import PriorityFrontier, IndexedPriorityFrontier
+
+
+class SortedListFrontier:
+    #the original list frontier: sort the whole list, then pop(0), on every expansion
+
+    def __init__(self):
+        self._items = []
+
+    def push(self, item, priority):
+        self._items.append((priority, item))
+        return True
+
+    def pop(self):
+        self._items.sort()
+        return self._items.pop(0)
+
+    def __len__(self):
+        return len(self._items)
+
+
+ALGORITHMS = {
+    'UCS': UCS,
+    'A*': A_Star,
+    'Greedy BFS': Greedy_BFS
+}
+
+FRONTIERS = {
+    'sorted-list': SortedListFrontier,
+    'heap': PriorityFrontier,
+    'indexed-heap': IndexedPriorityFrontier
+}
+
+
+def time_search(algorithm_func, grid_instance, frontier_cls):
+    #search from start1 to every treasure, like AlgorithmRunner does
+    start_time = time.perf_counter()
+    expanded = 0
+    for treasure in grid_instance.end:
+        result = algorithm_func(grid_instance.compiled, grid_instance.start1, treasure, frontier_cls=frontier_cls)
+        expanded += result[1]
+    return time.perf_counter() - start_time, expanded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare frontier implementations for UCS, A* and Greedy BFS")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 200, 1000])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--baseline-max', type=int, default=200,
+                        help="largest grid size the sorted-list baseline is run on")
+    args = parser.parse_args()
+
+    print(f"{'size':>6} {'algorithm':<12} {'frontier':<14} {'runtime':>10} {'expanded':>10} {'speedup':>9}")
+    for size in args.sizes:
+        grid_instance = Grid(n=size, seed=args.seed)
+        grid_instance.generate_grid()
+
+        for algorithm_name, algorithm_func in ALGORITHMS.items():
+            baseline = None
+            for frontier_name, frontier_cls in FRONTIERS.items():
+                if frontier_cls is SortedListFrontier and size > args.baseline_max:
+                    print(f"{size:>6} {algorithm_name:<12} {frontier_name:<14} {'skipped':>10}")
+                    continue
+
+                runtime, expanded = time_search(algorithm_func, grid_instance, frontier_cls)
+                if frontier_cls is SortedListFrontier:
+                    baseline = runtime
+                speedup = f"{baseline / runtime:.1f}x" if baseline else "N/A"
+                print(f"{size:>6} {algorithm_name:<12} {frontier_name:<14} {runtime:>9.4f}s {expanded:>10} {speedup:>9}")
+
+
+if __name__ == "__main__":
+    main()
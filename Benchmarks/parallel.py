@@ -0,0 +1,35 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from Algorithms import MiniMax, Alpha_Beta
+from Benchmarks.bench import run_job
+
+#fans benchmark jobs out over worker processes
+#every job spawns its own grid, sensor and opponent streams from its seed (Core/rng_streams.py),
+#so a record only depends on its (size, seed, algorithm, noise, move time) tuple and not on which worker
+#ran it or when. the exception is a per-move time budget: how deep Alpha-Beta gets within it
+#depends on how fast the worker is
+
+
+def _init_worker(depth):
+    if depth is not None:
+        MiniMax.MAX_DEPTH = depth
+        Alpha_Beta.MAX_DEPTH = depth
+
+
+def _run_job_tuple(job):
+    return run_job(*job)
+
+
+def default_chunksize(num_jobs, workers):
+    #about four chunks per worker keeps the pool balanced without paying IPC per job
+    return max(1, num_jobs // (workers * 4))
+
+
+def run_jobs_parallel(jobs, workers=None, chunksize=None, depth=None):
+    #returns one record per job, in job order regardless of worker count
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = default_chunksize(len(jobs), workers)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(depth,)) as executor:
+        return list(executor.map(_run_job_tuple, jobs, chunksize=chunksize))
@@ -1,10 +1,10 @@
 from .grid_game import Grid
-from .gui_manager import GUIManager
 from .algorithm_runner import AlgorithmRunner
 from .game_modes import GameMode, SinglePlayerMode, AIvsAIMode, HumanvsAIMode
 from .sensor_model import SensorModel
 from .bayesian_belief import BayesianBeliefMap
 from .bayesian_algorithm_runner import BayesianAlgorithmRunner
+from .run_log import RunLog
 
 __all__ = [
     'Grid',
@@ -16,5 +16,15 @@ __all__ = [
     'HumanvsAIMode',
     'SensorModel',
     'BayesianBeliefMap',
-    'BayesianAlgorithmRunner'
-]
\ No newline at end of file
+    'BayesianAlgorithmRunner',
+    'RunLog'
+]
+
+
+def __getattr__(name):
+    # GUIManager pulls in matplotlib, so it is only imported on first use
+    # and headless tools (Benchmarks/) can use the rest of Core without it
+    if name == 'GUIManager':
+        from .gui_manager import GUIManager
+        return GUIManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,13 +1,19 @@
+import math
 import time
 from Core.treasure_sorter import TreasureSorter
+from Core.tour_planner import TourPlanner
 from Core.path_calculator import PathCostCalculator
+from Core.run_log import RunLog, DEBUG, INFO
+from Algorithms.multi_target import multi_target_sweep, sweep_path, field_path
 
 
 class AlgorithmRunner:
-    def __init__(self, grid_instance, use_start2=False, sensor_model=None):
+    def __init__(self, grid_instance, use_start2=False, sensor_model=None, ordering='distance', log=None):
         self.grid = grid_instance
         self.use_start2 = use_start2  # If True, use start2 instead of start1
         self.sensor_model = sensor_model  # For noisy observations
+        self.ordering = ordering  # 'distance' (straight line from start) or 'tour' (TourPlanner)
+        self.log = log if log is not None else RunLog.console()  # Run summary on stdout by default
         self.solution_path = []
         self.expanded_nodes = 0
         self.heuristic_value = None
@@ -17,29 +23,17 @@ class AlgorithmRunner:
         self.current_algorithm = "None"
         self.total_steps = 0  # Total steps in the solution path
         self.total_scans = 0  # Total scans performed
+        self.ordering_savings = None  # Tour cost saved over the distance ordering
 
     def run_algorithm(self, algorithm_name, algorithm_func):
         start_time = time.time()
-
-        self.expanded_nodes = 0
-        self.solution_path = []
-        self.heuristic_value = None
-        self.pruned_branches = None
-        self.current_algorithm = algorithm_name
-        self.total_steps = 0
-        self.total_scans = 0
-
-        # Reset sensor scan count if sensor model exists
-        if self.sensor_model:
-            self.sensor_model.reset_scan_count()
-
-        if self.use_start2:
-            ai_start = self.grid.start2 if hasattr(self.grid, 'start2') and self.grid.start2 else self.grid.start
-        else:
-            ai_start = self.grid.start1 if hasattr(self.grid, 'start1') and self.grid.start1 else self.grid.start
+        ai_start = self._begin_run(algorithm_name)
 
         # Always search for all known treasures
-        sorted_treasures = TreasureSorter.sort_by_distance(self.grid.end, ai_start)
+        if self.ordering == 'tour':
+            sorted_treasures = self._plan_tour(ai_start)
+        else:
+            sorted_treasures = TreasureSorter.sort_by_distance(self.grid.end, ai_start)
 
         # If sensor model exists, perform initial scan around start position
         if self.sensor_model:
@@ -52,11 +46,11 @@ class AlgorithmRunner:
         heuristic_count = 0
 
         for treasure in sorted_treasures:
-            result = algorithm_func(self.grid.grid, start, treasure)
+            result = algorithm_func(self.grid.compiled, start, treasure)
             path, expanded, *extra = result
 
             if path is None:
-                print(f"Unreachable Treasure")
+                self.log.warning('unreachable_treasure', "Unreachable Treasure", treasure=treasure)
                 continue
 
             # Handle heuristic (3rd return value)
@@ -71,14 +65,7 @@ class AlgorithmRunner:
                 self.pruned_branches += extra[1]
 
             self.expanded_nodes += expanded
-
-            # Skip first element of sub-paths to avoid duplicates
-            if self.solution_path:  # If this is not the first path
-                for coord in path[1:]:  # Skip path[0] since already in solution path
-                    self.solution_path.append(coord)
-            else:  # First path - include everything
-                for coord in path:
-                    self.solution_path.append(coord)
+            self._append_path(path)
 
             # If sensor model exists, scan around the treasure we just reached
             if self.sensor_model:
@@ -89,9 +76,138 @@ class AlgorithmRunner:
         if heuristic_count > 0:
             self.heuristic_value = total_heuristic / heuristic_count
 
+        return self._finish_run(algorithm_name, start_time)
+
+    def run_multi_target(self, weighted=True):
+        # One Dijkstra (or BFS) sweep per leg settles the cost to every remaining treasure,
+        # the nearest by true path cost becomes the next leg and its path comes from the same sweep
+        algorithm_name = "Dijkstra (multi-target)" if weighted else "BFS (multi-target)"
+        start_time = time.time()
+        ai_start = self._begin_run(algorithm_name)
+
+        if self.sensor_model:
+            scan_radius = 3
+            self.sensor_model.scan_neighborhood(self.grid, ai_start[0], ai_start[1], radius=scan_radius)
+
+        start = ai_start
+        remaining = list(self.grid.end)
+
+        while remaining:
+            distances, parent, expanded = multi_target_sweep(self.grid.compiled, start, remaining, weighted)
+
+            # Every node settled by a sweep counts, including the ones shared between legs
+            self.expanded_nodes += expanded
+
+            for treasure in remaining:
+                if treasure not in distances:
+                    self.log.warning('unreachable_treasure', "Unreachable Treasure", treasure=treasure)
+            remaining = [t for t in remaining if t in distances]
+            if not remaining:
+                break
+
+            treasure = min(remaining, key=lambda t: (distances[t], t))
+            path = sweep_path(self.grid.compiled, parent, start, treasure)
+            self._append_path(path)
+
+            if self.sensor_model:
+                self.sensor_model.scan_neighborhood(self.grid, treasure[0], treasure[1], radius=scan_radius)
+
+            # Treasures passed over on the way are collected too
+            on_path = set(path)
+            remaining = [t for t in remaining if t not in on_path]
+            start = treasure
+
+        return self._finish_run(algorithm_name, start_time)
+
+    def run_treasure_fields(self):
+        # Same legs as run_multi_target, nearest treasure by true path cost first, but read off
+        # the grid's cached per-treasure fields: choosing a leg is one lookup per treasure and its
+        # path costs O(path length). Only the first runner to need a field pays for computing it,
+        # so on a shared grid the second player's planning is essentially free
+        algorithm_name = "Dijkstra (treasure fields)"
+        start_time = time.time()
+        ai_start = self._begin_run(algorithm_name)
+
+        if self.sensor_model:
+            scan_radius = 3
+            self.sensor_model.scan_neighborhood(self.grid, ai_start[0], ai_start[1], radius=scan_radius)
+
+        fields = {}
+        for treasure in self.grid.end:
+            distance, next_hop, expanded = self.grid.treasure_field(treasure)
+            fields[treasure] = (distance, next_hop)
+            self.expanded_nodes += expanded
+
+        start = ai_start
+        remaining = list(self.grid.end)
+
+        while remaining:
+            start_idx = self.grid.compiled.index(start)
+            for treasure in remaining:
+                if fields[treasure][0][start_idx] < 0:
+                    self.log.warning('unreachable_treasure', "Unreachable Treasure", treasure=treasure)
+            remaining = [t for t in remaining if fields[t][0][start_idx] >= 0]
+            if not remaining:
+                break
+
+            treasure = min(remaining, key=lambda t: (fields[t][0][start_idx], t))
+            path = field_path(self.grid.compiled, fields[treasure][1], start, treasure)
+            self._append_path(path)
+
+            if self.sensor_model:
+                self.sensor_model.scan_neighborhood(self.grid, treasure[0], treasure[1], radius=scan_radius)
+
+            # Treasures passed over on the way are collected too
+            on_path = set(path)
+            remaining = [t for t in remaining if t not in on_path]
+            start = treasure
+
+        return self._finish_run(algorithm_name, start_time)
+
+    def _plan_tour(self, ai_start):
+        treasures = list(self.grid.end)
+        tour, tour_cost, matrix, planning_expanded = TourPlanner.plan_tour(self.grid.compiled, treasures, ai_start)
+
+        # Price the straight-line ordering on the same matrix, skipping unreachable treasures
+        distance_order = [treasures.index(t) + 1 for t in TreasureSorter.sort_by_distance(treasures, ai_start)]
+        distance_order = [i for i in distance_order if matrix[0][i] != math.inf]
+        self.ordering_savings = TourPlanner.tour_cost(matrix, distance_order) - tour_cost
+
+        self.log.info('tour_planned', f"Tour Planning Nodes Expanded: {planning_expanded}",
+                      expanded_nodes=planning_expanded, ordering_savings=self.ordering_savings)
+        return tour
+
+    def _begin_run(self, algorithm_name):
+        self.expanded_nodes = 0
+        self.solution_path = []
+        self.heuristic_value = None
+        self.pruned_branches = None
+        self.current_algorithm = algorithm_name
+        self.total_steps = 0
+        self.total_scans = 0
+        self.ordering_savings = None
+
+        # Reset sensor scan count if sensor model exists
+        if self.sensor_model:
+            self.sensor_model.reset_scan_count()
+
+        if self.use_start2:
+            return self.grid.start2 if hasattr(self.grid, 'start2') and self.grid.start2 else self.grid.start
+        return self.grid.start1 if hasattr(self.grid, 'start1') and self.grid.start1 else self.grid.start
+
+    def _append_path(self, path):
+        # Skip first element of sub-paths to avoid duplicates
+        if self.solution_path:  # If this is not the first path
+            for coord in path[1:]:  # Skip path[0] since already in solution path
+                self.solution_path.append(coord)
+        else:  # First path - include everything
+            for coord in path:
+                self.solution_path.append(coord)
+
+    def _finish_run(self, algorithm_name, start_time):
         end_time = time.time()
         self.current_runtime = end_time - start_time
-        self.current_cost = PathCostCalculator.calculate_cost(self.solution_path, self.grid.grid)
+        self.current_cost = PathCostCalculator.calculate_cost(self.solution_path, self.grid.compiled)
 
         # Calculate total steps (length of solution path minus 1, since path includes start position)
         self.total_steps = len(self.solution_path) - 1 if len(self.solution_path) > 0 else 0
@@ -100,12 +216,24 @@ class AlgorithmRunner:
         if self.sensor_model:
             self.total_scans = self.sensor_model.get_scan_count()
 
-        print(f"Runtime {algorithm_name}: {self.current_runtime:.4f}s")
-        print(f"Nodes Expanded: {self.expanded_nodes}")
-        print(f"Total Cost: {self.current_cost}")
-        print(f"Total Steps: {self.total_steps}")
-        print(f"Total Scans: {self.total_scans}")
-        print(f"Solution Path: {self.solution_path}")
+        if self.log.enabled(INFO):
+            lines = [
+                f"Runtime {algorithm_name}: {self.current_runtime:.4f}s",
+                f"Nodes Expanded: {self.expanded_nodes}",
+                f"Total Cost: {self.current_cost}",
+                f"Total Steps: {self.total_steps}",
+                f"Total Scans: {self.total_scans}"
+            ]
+            if self.ordering_savings is not None:
+                lines.append(f"Tour Savings vs Distance Order: {self.ordering_savings}")
+            self.log.info('run_summary', "\n".join(lines), algorithm=algorithm_name,
+                          runtime=self.current_runtime, expanded_nodes=self.expanded_nodes,
+                          cost=self.current_cost, total_steps=self.total_steps,
+                          total_scans=self.total_scans, ordering_savings=self.ordering_savings)
+
+        # The full path is O(steps) to format, only built when someone logs at debug
+        if self.log.enabled(DEBUG):
+            self.log.debug('solution_path', f"Solution Path: {self.solution_path}", path=self.solution_path)
 
         return {
             'path': self.solution_path,
@@ -116,7 +244,8 @@ class AlgorithmRunner:
             'pruned_branches': self.pruned_branches,
             'algorithm': self.current_algorithm,
             'total_steps': self.total_steps,
-            'total_scans': self.total_scans
+            'total_scans': self.total_scans,
+            'ordering_savings': self.ordering_savings
         }
 
     def get_current_state(self):
@@ -128,7 +257,8 @@ class AlgorithmRunner:
             'heuristic': self.heuristic_value,
             'pruned_branches': self.pruned_branches,
             'total_steps': self.total_steps,
-            'total_scans': self.total_scans
+            'total_scans': self.total_scans,
+            'ordering_savings': self.ordering_savings
         }
 
     def reset(self):
@@ -141,3 +271,4 @@ class AlgorithmRunner:
         self.current_algorithm = "None"
         self.total_steps = 0
         self.total_scans = 0
+        self.ordering_savings = None
@@ -2,18 +2,26 @@ import time
 import numpy
 from Core.bayesian_belief import BayesianBeliefMap
 from Core.path_calculator import PathCostCalculator
+from Core.run_log import RunLog, DEBUG, INFO
+from Algorithms.connectivity import label_regions
 
 
 class BayesianAlgorithmRunner:
     
     
 
-    def __init__(self, grid_instance, use_start2=False, sensor_model=None):
+    def __init__(self, grid_instance, use_start2=False, sensor_model=None, utility_mode='euclidean',
+                 belief_backend='probability', log=None):
         self.grid = grid_instance
         self.use_start2 = use_start2
         self.sensor_model = sensor_model
+        self.utility_mode = utility_mode  #see BayesianBeliefMap.UTILITY_MODES
+        self.belief_backend = belief_backend  #see BayesianBeliefMap.BACKENDS
+        self.log = log if log is not None else RunLog.console()  #summary on stdout, heatmaps only if a sink asks
         self.solution_path = []
         self.expanded_nodes = 0
+        self.search_expansions = []  #expansions of every search call in order, failed ones included
+        self.unreachable_targets = 0  #targets outside the start's region, dropped without a search
         self.heuristic_value = None
         self.pruned_branches = None
         self.current_cost = 0
@@ -38,6 +46,8 @@ class BayesianAlgorithmRunner:
 
         #reset state
         self.expanded_nodes = 0
+        self.search_expansions = []
+        self.unreachable_targets = 0
         self.solution_path = []
         self.heuristic_value = None
         self.pruned_branches = None
@@ -63,7 +73,9 @@ class BayesianAlgorithmRunner:
         self.belief_map = BayesianBeliefMap(
             grid_size=self.grid.n,
             sensor_model=self.sensor_model,
-            num_treasures=self.total_treasures
+            num_treasures=self.total_treasures,
+            utility_mode=self.utility_mode,
+            backend=self.belief_backend
         )
         self.belief_map.set_grid(self.grid)
 
@@ -71,7 +83,7 @@ class BayesianAlgorithmRunner:
         self.belief_map.initialize_beliefs(ai_start, self.grid.walls)
 
         # --- Heatmap at t = 0 ---
-        self.belief_map.print_belief_grid(title = f"Belief at t = 0 scans")
+        self._belief_snapshot(0, f"Belief at t = 0 scans")
 
         #perform initial scan around start position
         scan_radius = 2
@@ -81,6 +93,13 @@ class BayesianAlgorithmRunner:
         current_pos = ai_start
         self.solution_path.append(current_pos)
 
+        #the agent only ever moves along paths, so it stays in the start's region and a target in
+        #any other region is unreachable. a search would have to exhaust the whole region to
+        #find that out, the region labels answer it without one
+        compiled = self.grid.compiled
+        regions = label_regions(compiled.open).ravel()
+        start_region = regions[compiled.index(ai_start)]
+
         #addup heuristic values
         total_heuristic = 0
         heuristic_count = 0
@@ -101,12 +120,22 @@ class BayesianAlgorithmRunner:
                 if target is None:
                     break
 
+            if regions[compiled.index(target)] != start_region:
+                #unreachable, never offer it again as a belief target or as an unscanned cell
+                self.unreachable_targets += 1
+                self.belief_map.confirm_empty(target)
+                self.belief_map.unobserved.mark_observed(target)
+                continue
+
             #find path to target using algorithm
-            result = algorithm_func(self.grid.grid, current_pos, target)
+            result = algorithm_func(compiled, current_pos, target)
             path, expanded, *extra = result
+            self.search_expansions.append(expanded)
 
             if path is None:
+                #the algorithm gave up on it, drop it the same way
                 self.belief_map.confirm_empty(target)
+                self.belief_map.unobserved.mark_observed(target)
                 continue
 
             #track metrics
@@ -136,7 +165,7 @@ class BayesianAlgorithmRunner:
             observations = self.belief_map.scan_neighborhood_and_update(target, radius=scan_radius)
 
             # --- Heatmap after each scan ---
-            self.belief_map.print_belief_grid(title = f"Belief after t = {iteration} scans")
+            self._belief_snapshot(iteration, f"Belief after t = {iteration} scans")
 
             #check found treasure at target
             actual_tile = self.grid.get_tile(target[0], target[1])
@@ -145,7 +174,9 @@ class BayesianAlgorithmRunner:
                 self.treasures_found += 1
                 
                 # --- Heatmap at detection ---
-                self.belief_map.print_belief_grid(title = f"Belief at detection")
+                self.log.debug('treasure_found', f"Treasure found at {target}", position=target, scans=iteration,
+                               entropy=self.belief_map.entropy_at_detection[-1])
+                self._belief_snapshot(iteration, f"Belief at detection")
 
                 #stop if all treasures found
                 if self.treasures_found >= self.total_treasures:
@@ -160,7 +191,7 @@ class BayesianAlgorithmRunner:
 
         end_time = time.time()
         self.current_runtime = end_time - start_time
-        self.current_cost = PathCostCalculator.calculate_cost(self.solution_path, self.grid.grid)
+        self.current_cost = PathCostCalculator.calculate_cost(self.solution_path, self.grid.compiled)
         self.total_steps = len(self.solution_path) - 1 if len(self.solution_path) > 0 else 0
 
         if self.sensor_model:
@@ -169,28 +200,51 @@ class BayesianAlgorithmRunner:
         #get belief metrics
         self.belief_metrics = self.belief_map.get_metrics()
 
-        #print summary
-        print(f"Runtime {algorithm_name}: {self.current_runtime:.4f}s")
-        print(f"Treasures Found: {self.treasures_found}/{self.total_treasures}")
-        print(f"Nodes Expanded: {self.expanded_nodes}")
-        print(f"Total Cost: {self.current_cost}")
-        print(f"Total Steps: {self.total_steps}")
-        print(f"Total Scans: {self.total_scans}")
-        print(f"Belief Updates: {self.belief_metrics['belief_updates']}")
-        print(f"Final Entropy: {self.belief_metrics['current_entropy']:.4f}")
-        print(f"Solution Path: {self.solution_path}")
-        print(f"Detection Accuracy: {self.belief_metrics['detection_accuracy']:.3f}")
-        print(f"Correct Predictions: {self.belief_metrics['correct_predictions']}/{self.belief_metrics['predictions']}")    
-        print(f"Entropy at each detection: {self.belief_metrics['entropy_at_detection']}")
-        print(f"Average Entropy at Detection: {self.belief_metrics['avg_entropy_at_detection']:.4f}")
-
-
+        #log summary
+        if self.log.enabled(INFO):
+            metrics = self.belief_metrics
+            lines = [
+                f"Runtime {algorithm_name}: {self.current_runtime:.4f}s",
+                f"Treasures Found: {self.treasures_found}/{self.total_treasures}",
+                f"Nodes Expanded: {self.expanded_nodes}",
+                f"Total Cost: {self.current_cost}",
+                f"Total Steps: {self.total_steps}",
+                f"Total Scans: {self.total_scans}",
+                f"Belief Updates: {metrics['belief_updates']}"
+            ]
+            if self.utility_mode != 'euclidean':
+                lines.append(f"Targeting Nodes Expanded: {metrics['targeting_expanded_nodes']}")
+            lines += [
+                f"Final Entropy: {metrics['current_entropy']:.4f}",
+                f"Detection Accuracy: {metrics['detection_accuracy']:.3f}",
+                f"Correct Predictions: {metrics['correct_predictions']}/{metrics['predictions']}",
+                f"Entropy at each detection: {metrics['entropy_at_detection']}",
+                f"Average Entropy at Detection: {metrics['avg_entropy_at_detection']:.4f}"
+            ]
+            self.log.info('run_summary', "\n".join(lines), algorithm=self.current_algorithm,
+                          runtime=self.current_runtime, treasures_found=self.treasures_found,
+                          total_treasures=self.total_treasures, expanded_nodes=self.expanded_nodes,
+                          searches=len(self.search_expansions), unreachable_targets=self.unreachable_targets,
+                          cost=self.current_cost, total_steps=self.total_steps, total_scans=self.total_scans,
+                          belief_updates=metrics['belief_updates'],
+                          targeting_expanded_nodes=metrics['targeting_expanded_nodes'],
+                          final_entropy=metrics['current_entropy'],
+                          detection_accuracy=metrics['detection_accuracy'],
+                          correct_predictions=metrics['correct_predictions'], predictions=metrics['predictions'],
+                          entropy_at_detection=metrics['entropy_at_detection'],
+                          avg_entropy_at_detection=metrics['avg_entropy_at_detection'])
+
+        #the full path is O(steps) to format, only built when someone logs at debug
+        if self.log.enabled(DEBUG):
+            self.log.debug('solution_path', f"Solution Path: {self.solution_path}", path=self.solution_path)
 
         return {
             'path': self.solution_path,
             'cost': self.current_cost,
             'runtime': self.current_runtime,
             'expanded_nodes': self.expanded_nodes,
+            'search_expansions': self.search_expansions,
+            'unreachable_targets': self.unreachable_targets,
             'heuristic': self.heuristic_value,
             'pruned_branches': self.pruned_branches,
             'algorithm': self.current_algorithm,
@@ -201,22 +255,13 @@ class BayesianAlgorithmRunner:
             'belief_metrics': self.belief_metrics
         }
 
+    def _belief_snapshot(self, scans, title):
+        #the belief grid is only materialized and handed over if a sink takes snapshots
+        self.log.snapshot(DEBUG, 'beliefs', lambda: self.belief_map.beliefs, scans=scans, title=title)
+
     def _find_unscanned_cell(self, current_pos):
         """Find the nearest unscanned cell"""
-        min_distance = float('inf')
-        nearest_cell = None
-
-        for i in range(self.grid.n):
-            for j in range(self.grid.n):
-                pos = (i, j)
-                if pos not in self.belief_map.observed_cells:
-                    if pos not in self.belief_map.confirmed_walls:
-                        distance = abs(i - current_pos[0]) + abs(j - current_pos[1])
-                        if distance < min_distance:
-                            min_distance = distance
-                            nearest_cell = pos
-
-        return nearest_cell
+        return self.belief_map.unobserved.nearest(current_pos)
 
     def get_current_state(self):
         """Get current state including belief metrics"""
@@ -243,6 +288,8 @@ class BayesianAlgorithmRunner:
         """Reset runner state"""
         self.solution_path = []
         self.expanded_nodes = 0
+        self.search_expansions = []
+        self.unreachable_targets = 0
         self.heuristic_value = None
         self.pruned_branches = None
         self.current_cost = 0
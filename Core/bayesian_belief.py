@@ -1,32 +1,75 @@
 import numpy as np
-import math
-import matplotlib.pyplot as plt
+from Algorithms.compiled_grid import STEP_COSTS, TRAP
+from Algorithms.multi_target import distance_field
+from Core.belief_store import BACKENDS, OBSERVED_TREASURE, OBSERVED_EMPTY, OBSERVED_BLOCKED
+from Core.unobserved_index import UnobservedIndex
 
 
 class BayesianBeliefMap:
     #maintains belief distribution over grid cells for treasure locations
-    
 
-    def __init__(self, grid_size, sensor_model, num_treasures):
+    #how get_best_target measures distance to a cell:
+    #euclidean - straight line, ignores walls
+    #path      - fewest steps around walls (BFS distance field)
+    #cost      - cheapest path by the step costs the agent knows (Dijkstra distance field):
+    #            confirmed traps cost 5, every other cell 1. the true tile costs would give
+    #            away where the hidden treasures (cost 0) and traps are
+    UTILITY_MODES = ('euclidean', 'path', 'cost')
+
+    #the tracked entropy is recomputed exactly after this many recordings to stop drift
+    ENTROPY_RESYNC_INTERVAL = 1000
+
+    #how beliefs are stored, see Core/belief_store.py:
+    #probability - normalized probabilities, renormalized on every change
+    #log_odds    - per-cell log-odds, normalized lazily when probabilities are read
+    BACKENDS = tuple(BACKENDS)
+
+    def __init__(self, grid_size, sensor_model, num_treasures, cache_distance_kernel=True, utility_mode='euclidean',
+                 backend='probability'):
+        if utility_mode not in self.UTILITY_MODES:
+            raise ValueError(f"unknown utility mode {utility_mode!r}, expected one of {self.UTILITY_MODES}")
+        if backend not in BACKENDS:
+            raise ValueError(f"unknown belief backend {backend!r}, expected one of {self.BACKENDS}")
+
         self.n = grid_size
         self.sensor_model = sensor_model
         self.num_treasures = num_treasures
 
         #initialize uniform prior belief for each cell
-        self.beliefs = np.ones((grid_size, grid_size)) / (grid_size * grid_size)
+        self.backend = backend
+        self._store = BACKENDS[backend](grid_size)
 
         #track which cells have been observed
         self.observed_cells = set()
 
+        #cells neither observed nor a confirmed wall, for nearest-unscanned lookups
+        self.unobserved = UnobservedIndex(grid_size)
+
         #track found treasures
         self.found_treasures = set()
         self.confirmed_empty = set()
         self.confirmed_walls = set()
         self.confirmed_traps = set()
 
+        #cells that can never be a target (found, empty, wall or trap), mirrors the sets above
+        self.excluded = np.zeros((grid_size, grid_size), dtype=bool)
+
+        #inverse euclidean distance kernel of shape (2n-1, 2n-1) centred on the agent,
+        #built on first use; the field for a position is a view into it
+        self.cache_distance_kernel = cache_distance_kernel
+        self._inverse_distance_kernel = None
+
+        #path distance field from the agent's position, kept until the agent moves
+        self.utility_mode = utility_mode
+        self._path_field_pos = None
+        self._path_field_inverse = None
+        self._known_step_cost = [1] * (grid_size * grid_size) if utility_mode == 'cost' else None
+        self.targeting_expanded_nodes = 0
+
         #metrics tracking
-        self.entropy_history = []
         self.belief_updates = 0
+        self._entropy_buffer = np.empty(256)  #entropy_history storage, doubled when full
+        self._entropy_count = 0
 
         #grid reference
         self.grid_instance = None
@@ -38,84 +81,33 @@ class BayesianBeliefMap:
         # for detecting entropy at detection
         self.entropy_at_detection = []
 
+    @property
+    def beliefs(self):
+        #normalized n x n belief grid, materialized by the log-odds backend on demand
+        return self._store.probabilities()
+
     def set_grid(self, grid_instance):
         self.grid_instance = grid_instance
 
-    def initialize_beliefs(self, start_pos, walls):
-        #wet start position to 0 belief
-        self.beliefs[start_pos[0]][start_pos[1]] = 0.0
+    def _remaining_treasures(self):
+        return self.num_treasures - len(self.found_treasures)
 
-        #set all wall positions to 0 belief
+    def initialize_beliefs(self, start_pos, walls):
+        #set start position and all wall positions to 0 belief
         for wall in walls:
-            self.beliefs[wall[0]][wall[1]] = 0.0
             self.confirmed_walls.add(wall)
+            self.excluded[wall[0], wall[1]] = True
+        self.unobserved.mark_all_observed(walls)
 
         #renormalize after setting known positions
-        self._normalize_beliefs()
+        self._store.initialize([tuple(start_pos)] + [tuple(wall) for wall in walls], self._remaining_treasures())
 
         #record initial entropy
         self._record_entropy()
 
     def update_belief(self, position, observation):
-    
         # bayes rule :P(T|obs) = P(obs|T) * P(T) / P(obs)
-        row, col = position
-
-        #skip if already confirmed
-        if position in self.found_treasures:
-            return
-        if position in self.confirmed_walls:
-            return
-
-        #marked as observed
-        self.observed_cells.add(position)
-        self.belief_updates += 1
-
-        #get noise
-        fp_rate = self.sensor_model.false_positive_rate
-        fn_rate = self.sensor_model.false_negative_rate
-
-        #prior belief
-        prior = self.beliefs[row][col]
-
-        #calculate likelihoods based on observation
-        if observation == 'T':
-            likelihood_treasure = 1.0 - fn_rate
-            likelihood_empty = fp_rate
-        elif observation == ' ':
-            likelihood_treasure = fn_rate
-            likelihood_empty = 1.0 - fp_rate
-        elif observation == 'X':
-            self.confirmed_traps.add(position)
-            self.beliefs[row][col] = 0.0
-            self._normalize_beliefs()
-            self._record_entropy()
-            return
-        elif observation == '#':
-            self.confirmed_walls.add(position)
-            self.beliefs[row][col] = 0.0
-            self._normalize_beliefs()
-            self._record_entropy()
-            return
-        else:
-            return
-
-        #apply Bayes rule
-        p_obs = likelihood_treasure * prior + likelihood_empty * (1.0 - prior)
-
-        if p_obs > 0:
-            posterior = (likelihood_treasure * prior) / p_obs
-        else:
-            posterior = prior
-
-        #update belief
-        self.beliefs[row][col] = posterior
-
-        #renormalize to make sure beliefs sum correctly
-        self._normalize_beliefs()
-
-        #record entropy
-        self._record_entropy()
+        self.update_beliefs_batch({position: observation})
 
     def scan_and_update(self, position):
         row, col = position
@@ -124,27 +116,59 @@ class BayesianBeliefMap:
         return observation
 
     def scan_neighborhood_and_update(self, position, radius=1):
-        observations = {}
-        row, col = position
+        #sample the whole window first, then update it as one batch
+        observations = self.sensor_model.scan_neighborhood(self.grid_instance, position[0], position[1], radius)
+        self.update_beliefs_batch(observations)
+        return observations
 
-        for dr in range(-radius, radius + 1):
-            for dc in range(-radius, radius + 1):
-                r, c = row + dr, col + dc
-                if 0 <= r < self.n and 0 <= c < self.n:
-                    obs = self.scan_and_update((r, c))
-                    observations[(r, c)] = obs
+    def update_beliefs_batch(self, observations):
+        #same posterior as applying Bayes rule cell by cell in order, but the grid is
+        #normalized and its entropy recorded once per batch instead of once per cell
+        positions = []
+        codes = []
+        for position, observation in observations.items():
+            #skip if already confirmed
+            if position in self.found_treasures or position in self.confirmed_walls:
+                continue
+
+            #marked as observed
+            self.observed_cells.add(position)
+            self.unobserved.mark_observed(position)
+            self.belief_updates += 1
+
+            if observation == 'T':
+                codes.append(OBSERVED_TREASURE)
+            elif observation == ' ':
+                codes.append(OBSERVED_EMPTY)
+            elif observation == 'X':
+                self.confirmed_traps.add(position)
+                self._know_trap(position)
+                self.excluded[position] = True
+                codes.append(OBSERVED_BLOCKED)
+            elif observation == '#':
+                self.confirmed_walls.add(position)
+                self.excluded[position] = True
+                codes.append(OBSERVED_BLOCKED)
+            else:
+                continue
+            positions.append(position)
+
+        if not positions:
+            return
 
-        return observations
+        self._store.observe(positions, codes, self.sensor_model.false_positive_rate,
+                            self.sensor_model.false_negative_rate, self._remaining_treasures())
+        self._record_entropy()
 
     def confirm_treasure_found(self, position):
         self.found_treasures.add(position)
-        self.beliefs[position[0]][position[1]] = 0.0
+        self.excluded[position] = True
 
         #if found all treasures zero out all beliefs
         if len(self.found_treasures) >= self.num_treasures:
-            self.beliefs.fill(0.0)
+            self._store.clear()
         else:
-            self._normalize_beliefs()
+            self._store.zero(position, self._remaining_treasures())
 
         self._record_entropy()
 
@@ -155,79 +179,89 @@ class BayesianBeliefMap:
     def confirm_empty(self, position):
         if position not in self.found_treasures and position not in self.confirmed_walls:
             self.confirmed_empty.add(position)
-            self.beliefs[position[0]][position[1]] = 0.0
-            self._normalize_beliefs()
+            self.excluded[position] = True
+            self._store.zero(position, self._remaining_treasures())
             self._record_entropy()
 
     def get_best_target(self, current_pos, exclude_positions=None):
-        if exclude_positions is None:
-            exclude_positions = set()
-
-        best_target = None
-        best_utility = -float('inf')
-
-        for i in range(self.n):
-            for j in range(self.n):
-                pos = (i, j)
-
-                #skip excluded positions
-                if pos in exclude_positions:
-                    continue
-
-                #skip confirmed non treasures
-                if pos in self.confirmed_empty or pos in self.confirmed_walls or pos in self.confirmed_traps:
-                    continue
-
-                #skip already found treasures
-                if pos in self.found_treasures:
-                    continue
+        #belief weighted by inverse distance, best over all cells that are not excluded
+        #and not below the belief floor; ties go to the first cell in row-major order
+        candidates = ~self.excluded & (self.beliefs >= 0.0001)
+        if exclude_positions:
+            rows, cols = np.array(list(exclude_positions)).reshape(-1, 2).T
+            candidates[rows, cols] = False
+
+        if self.utility_mode == 'euclidean':
+            inverse_distance = self._inverse_distance_field(current_pos)
+        else:
+            inverse_distance = self._inverse_path_field(current_pos)
+            candidates &= inverse_distance > 0  #unreachable cells
 
-                belief = self.beliefs[i][j]
+        utility = np.where(candidates, self.beliefs * inverse_distance, -np.inf)
+        best = int(np.argmax(utility))
+        if utility.flat[best] == -np.inf:
+            return None
 
-                #skip cells with low belief
-                if belief < 0.0001:
-                    continue
+        return divmod(best, self.n)
 
-                #calculate distance
-                distance = math.sqrt((i - current_pos[0])**2 + (j - current_pos[1])**2)
-                if distance == 0:
-                    distance = 1
+    def _know_trap(self, position):
+        #a newly confirmed trap changes the known costs, so the cost field has to be rebuilt
+        if self._known_step_cost is None:
+            return
+        idx = position[0] * self.n + position[1]
+        if self._known_step_cost[idx] != STEP_COSTS[TRAP]:
+            self._known_step_cost[idx] = int(STEP_COSTS[TRAP])
+            self._path_field_pos = None
+
+    def _inverse_path_field(self, position):
+        #1 / shortest path distance from position, 0 where unreachable; rebuilt only when the agent
+        #moves or, in cost mode, when a trap is confirmed
+        if position != self._path_field_pos:
+            field, expanded = distance_field(self.grid_instance.compiled, position,
+                                             weighted=self.utility_mode == 'cost',
+                                             step_cost=self._known_step_cost)
+            self.targeting_expanded_nodes += expanded
+            field[field == 0] = 1.0
+            self._path_field_inverse = 1.0 / field
+            self._path_field_pos = position
+        return self._path_field_inverse
+
+    def _inverse_distance_field(self, position):
+        #1 / euclidean distance from position to every cell, the position itself counts as 1
+        row, col = position
+        n = self.n
 
-                #expect utility being belief weighted by inverse distance
-                utility = belief * (1.0 / distance)
+        if not self.cache_distance_kernel:
+            rows, cols = np.ogrid[:n, :n]
+            distance = np.sqrt((rows - row) ** 2 + (cols - col) ** 2)
+            distance[row, col] = 1.0
+            return 1.0 / distance
 
-                if utility > best_utility:
-                    best_utility = utility
-                    best_target = pos
+        if self._inverse_distance_kernel is None:
+            offsets = np.arange(-(n - 1), n)
+            distance = np.sqrt(offsets[:, None] ** 2 + offsets[None, :] ** 2)
+            distance[n - 1, n - 1] = 1.0
+            self._inverse_distance_kernel = 1.0 / distance
 
-        return best_target
+        return self._inverse_distance_kernel[n - 1 - row:2 * n - 1 - row, n - 1 - col:2 * n - 1 - col]
 
     def calculate_entropy(self):
-        #calculate entropy  belief distribution
-        probs = self.beliefs.flatten()
-        probs = probs[probs > 0]
-
-        if len(probs) == 0:
-            return 0.0
+        #entropy of the belief distribution, -sum(b * log(b)) over cells with b > 0
+        return self._store.entropy()
 
-        entropy = -np.sum(probs * np.log(probs + 1e-12))
-        return entropy
+    @property
+    def entropy_history(self):
+        return self._entropy_buffer[:self._entropy_count]
 
-    def _normalize_beliefs(self):
-        #normalize beliefs to sum to expected number of leftover treasure
-        remaining_treasures = self.num_treasures - len(self.found_treasures)
+    def _record_entropy(self):
+        if self._entropy_count % self.ENTROPY_RESYNC_INTERVAL == 0:
+            self._store.recompute_entropy()
 
-        if remaining_treasures <= 0:
-            self.beliefs.fill(0.0)
-            return
+        if self._entropy_count == len(self._entropy_buffer):
+            self._entropy_buffer = np.concatenate((self._entropy_buffer, np.empty(len(self._entropy_buffer))))
 
-        total = np.sum(self.beliefs)
-        if total > 0:
-            self.beliefs = self.beliefs * (remaining_treasures / total)
-
-    def _record_entropy(self):
-        entropy = self.calculate_entropy()
-        self.entropy_history.append(entropy)
+        self._entropy_buffer[self._entropy_count] = self.calculate_entropy()
+        self._entropy_count += 1
 
     def get_metrics(self):
         accuracy = (
@@ -244,6 +278,7 @@ class BayesianBeliefMap:
             'current_entropy': self.calculate_entropy(),
             'entropy_history': self.entropy_history.copy(),
             'belief_updates': self.belief_updates,
+            'targeting_expanded_nodes': self.targeting_expanded_nodes,
             'observed_cells': len(self.observed_cells),
             'found_treasures': len(self.found_treasures),
             'treasures_remaining': self.num_treasures - len(self.found_treasures),
@@ -257,14 +292,6 @@ class BayesianBeliefMap:
     def should_continue_search(self):
         return len(self.found_treasures) < self.num_treasures
 
-    def print_belief_grid(self, title="Belief Grid"):
-        print(f"\n=== {title} ===")
-        for r in range(self.n):
-            row_vals = []
-            for c in range(self.n):
-                row_vals.append(f"{self.beliefs[r][c]:.4f}")
-            print(" ".join(row_vals))
-
     # detecting accuracy
     def record_prediction(self, position, actual_tile):
         """Record whether selecting this cell was a correct prediction."""
@@ -0,0 +1,228 @@
+import numpy as np
+
+#observation codes used by the belief stores
+OBSERVED_TREASURE = 0  #'T'
+OBSERVED_EMPTY = 1  #' '
+OBSERVED_BLOCKED = 2  #trap or wall, the cell can no longer hold a treasure
+
+
+def _plogp(values):
+    #sum of p * log(p), with 0 * log(0) taken as 0
+    values = np.asarray(values, dtype=float)
+    positive = values[values > 0]
+    return float(np.sum(positive * np.log(positive)))
+
+
+class ProbabilityBeliefs:
+    #beliefs stored as probabilities that always sum to the number of treasures left
+    #every change renormalizes the whole grid, like the original single-array belief map
+
+    def __init__(self, n):
+        self.n = n
+        self.beliefs = np.ones((n, n)) / (n * n)
+
+        #entropy is kept up to date from the running sums of b and b*log(b) over all cells,
+        #which every cell write and every uniform rescale adjusts in O(1)
+        self._mass = 0.0
+        self._plogp = 0.0
+        self.recompute_entropy()
+
+    def probabilities(self):
+        return self.beliefs
+
+    def entropy(self):
+        #0.0 - rather than a bare negation, so an empty grid reports 0.0 and not -0.0
+        return 0.0 - self._plogp
+
+    def recompute_entropy(self):
+        #exact O(n^2) pass that resets the running sums
+        self._mass = float(np.sum(self.beliefs))
+        self._plogp = _plogp(self.beliefs)
+
+    def initialize(self, zero_positions, remaining_treasures):
+        for position in zero_positions:
+            self.beliefs[position] = 0.0
+        self.recompute_entropy()
+        self._normalize(remaining_treasures)
+
+    def zero(self, position, remaining_treasures):
+        self._set(position, 0.0)
+        self._normalize(remaining_treasures)
+
+    def clear(self):
+        self.beliefs.fill(0.0)
+        self._mass = 0.0
+        self._plogp = 0.0
+
+    def observe(self, positions, codes, fp_rate, fn_rate, remaining_treasures):
+        #same posterior as applying Bayes rule and renormalizing after each cell in order,
+        #but the grid itself is only rescaled once
+        if remaining_treasures <= 0:
+            self.clear()
+            return
+
+        rows, cols = np.array(positions).reshape(-1, 2).T
+        codes = np.asarray(codes)
+        priors = self.beliefs[rows, cols]
+
+        #likelihoods per observation code ('T', ' '), traps and walls are zeroed below
+        likelihood_treasure = np.array([1.0 - fn_rate, fn_rate, 0.0])[codes]
+        likelihood_empty = np.array([fp_rate, 1.0 - fp_rate, 0.0])[codes]
+
+        #the sequential update renormalizes after every cell, so each cell's prior is its stored
+        #belief times the scale of the normalizations before it. the scale is tracked per cell
+        #here and the grid itself is only rescaled once at the end
+        scale = 1.0
+        total = float(np.sum(self.beliefs))
+        stored = np.empty(len(positions))
+        for k in range(len(positions)):
+            prior = scale * priors[k]
+            if codes[k] == OBSERVED_BLOCKED:
+                posterior = 0.0
+            else:
+                p_obs = likelihood_treasure[k] * prior + likelihood_empty[k] * (1.0 - prior)
+                posterior = (likelihood_treasure[k] * prior) / p_obs if p_obs > 0 else prior
+
+            stored[k] = posterior / scale
+            total += posterior - prior
+            if total > 0:
+                scale *= remaining_treasures / total
+                total = remaining_treasures
+
+        self.beliefs[rows, cols] = stored
+        self._mass += float(np.sum(stored) - np.sum(priors))
+        self._plogp += _plogp(stored) - _plogp(priors)
+        self._rescale(scale)
+
+    def _set(self, position, value):
+        old = self.beliefs[position]
+        self.beliefs[position] = value
+        self._mass += value - old
+        self._plogp += _plogp(value) - _plogp(old)
+
+    def _rescale(self, scale):
+        #sum((s*b) * log(s*b)) = s * sum(b * log(b)) + s * log(s) * sum(b)
+        self.beliefs *= scale
+        self._plogp = scale * self._plogp + scale * np.log(scale) * self._mass
+        self._mass *= scale
+
+    def _normalize(self, remaining_treasures):
+        #normalize beliefs to sum to expected number of leftover treasure
+        if remaining_treasures <= 0:
+            self.clear()
+            return
+
+        total = np.sum(self.beliefs)
+        if total > 0:
+            self._rescale(remaining_treasures / total)
+
+
+class LogOddsBeliefs:
+    #beliefs stored as independent per-cell log-odds l = log(p / (1 - p))
+    #an observation adds log(P(obs|T) / P(obs|empty)) to its cell and never touches the rest
+    #of the grid; probabilities are only materialized, as sigmoid(l) rescaled to the number of
+    #treasures left, when someone asks for them. cells that cannot hold a treasure are -inf
+
+    #log-odds are clamped to +-LIMIT so a noise-free observation (infinite ratio) can still be
+    #overturned by a later one, as it can in the probability store
+    LIMIT = 50.0
+
+    def __init__(self, n):
+        self.n = n
+        prior = 1.0 / (n * n)
+        self.log_odds = np.full((n, n), np.clip(np.log(prior) - np.log1p(-prior), -self.LIMIT, self.LIMIT))
+        self.remaining_treasures = 1
+
+        #running sums of s = sigmoid(l) and s*log(s), enough for the normalized entropy
+        self._mass = 0.0
+        self._plogp = 0.0
+        self._probabilities = None  #materialized grid, None once stale
+        self.recompute_entropy()
+
+    @staticmethod
+    def _sigmoid(log_odds):
+        return 1.0 / (1.0 + np.exp(-log_odds))
+
+    def probabilities(self):
+        if self._probabilities is None:
+            if self.remaining_treasures <= 0 or self._mass <= 0:
+                self._probabilities = np.zeros((self.n, self.n))
+            else:
+                self._probabilities = self._sigmoid(self.log_odds) * (self.remaining_treasures / self._mass)
+        return self._probabilities
+
+    def entropy(self):
+        #with p = k * s and k = remaining / sum(s): sum(p * log(p)) = k * (sum(s * log(s)) + log(k) * sum(s))
+        if self.remaining_treasures <= 0 or self._mass <= 0:
+            return 0.0
+        k = self.remaining_treasures / self._mass
+        return -k * (self._plogp + np.log(k) * self._mass)
+
+    def recompute_entropy(self):
+        #exact O(n^2) pass that resets the running sums
+        s = self._sigmoid(self.log_odds)
+        self._mass = float(np.sum(s))
+        self._plogp = _plogp(s)
+
+    def initialize(self, zero_positions, remaining_treasures):
+        #every open cell starts at the normalized prior the probability store would give it,
+        #remaining treasures spread evenly, so the two stores agree on what a cell is worth
+        for position in zero_positions:
+            self.log_odds[position] = -np.inf
+        candidates = ~np.isneginf(self.log_odds)
+        open_cells = int(np.count_nonzero(candidates))
+        if open_cells and remaining_treasures > 0:
+            prior = remaining_treasures / open_cells
+            with np.errstate(divide='ignore'):
+                prior_log_odds = np.log(prior) - np.log1p(-prior) if prior < 1 else np.inf
+            self.log_odds[candidates] = np.clip(prior_log_odds, -self.LIMIT, self.LIMIT)
+        self.remaining_treasures = remaining_treasures
+        self.recompute_entropy()
+        self._probabilities = None
+
+    def zero(self, position, remaining_treasures):
+        self.remaining_treasures = remaining_treasures
+        self._write(np.array([position[0]]), np.array([position[1]]), np.array([-np.inf]))
+
+    def clear(self):
+        self.log_odds.fill(-np.inf)
+        self._mass = 0.0
+        self._plogp = 0.0
+        self._probabilities = None
+
+    def observe(self, positions, codes, fp_rate, fn_rate, remaining_treasures):
+        #cells are independent, so the whole window is one vectorized update
+        self.remaining_treasures = remaining_treasures
+        if remaining_treasures <= 0:
+            self.clear()
+            return
+
+        rows, cols = np.array(positions).reshape(-1, 2).T
+        codes = np.asarray(codes)
+        old = self.log_odds[rows, cols]
+
+        likelihood_treasure = np.array([1.0 - fn_rate, fn_rate, 0.0])[codes]
+        likelihood_empty = np.array([fp_rate, 1.0 - fp_rate, 1.0])[codes]
+
+        with np.errstate(divide='ignore'):
+            ratio = np.log(likelihood_treasure) - np.log(likelihood_empty)
+        new = np.clip(old + np.nan_to_num(ratio, posinf=2 * self.LIMIT, neginf=-2 * self.LIMIT),
+                      -self.LIMIT, self.LIMIT)
+
+        #cells already ruled out stay ruled out, traps and walls are ruled out now
+        new[np.isneginf(old) | (codes == OBSERVED_BLOCKED)] = -np.inf
+        self._write(rows, cols, new)
+
+    def _write(self, rows, cols, new):
+        old = self._sigmoid(self.log_odds[rows, cols])
+        self.log_odds[rows, cols] = new
+        s = self._sigmoid(new)
+        self._mass += float(np.sum(s) - np.sum(old))
+        self._plogp += _plogp(s) - _plogp(old)
+        self._probabilities = None
+
+
+BACKENDS = {
+    'probability': ProbabilityBeliefs,
+    'log_odds': LogOddsBeliefs
+}
@@ -1,41 +1,73 @@
 import random
 import numpy as np
+from Algorithms.compiled_grid import CompiledGrid, TILE_CHARS, EMPTY, WALL, START, TREASURE, TRAP
+from Algorithms.connectivity import label_regions
+from Algorithms.multi_target import treasure_field
+from Algorithms.landmarks import Landmarks
 
 class Grid:
-    def __init__(self, n=20, seed=None):
+    # fast   - walls sampled without replacement in one call, every treasure and both starts
+    #          are made reachable from start1 (one flood fill, corridors carved where needed)
+    # legacy - the original rejection sampler, kept to reproduce layouts from older seeds;
+    #          makes no reachability guarantee
+    GENERATORS = ('fast', 'legacy')
+
+    # Landmarks picked for the ALT heuristic (see Grid.landmarks)
+    LANDMARKS = 8
+
+    def __init__(self, n=20, seed=None, rng=None, generator='fast'):
+        if generator not in self.GENERATORS:
+            raise ValueError(f"unknown grid generator {generator!r}, expected one of {self.GENERATORS}")
         self.n = n
+        self.generator = generator
         self.grid = []
         self.seed = seed
+        # Layout stream: an explicit random.Random (e.g. RunStreams.grid) or one seeded from seed,
+        # never the global random module, so generating a grid does not disturb anything else
+        self.rng = rng if rng is not None else random.Random(seed)
         self.start = None
         self.start1 = None  # Player 1 starting position (AI or first player)
         self.start2 = None  # Player 2 starting position (Human or second player)
         self.end = []  # List of treasure positions
         self.traps = []
         self.walls = []
+        self._compiled = None  # Array view of self.grid, built on first use
+        self._tiles = None  # Tile codes left by the fast generator, saves compile from re-parsing
+        self._treasure_fields = {}  # treasure -> (distance, next hop), built on first use
+        self._landmarks = None  # ALT landmarks, built on first use
+        self.carved_walls = 0  # Walls the fast generator removed to connect the grid
 
     def generate_grid(self, seed=None):
         # Set random seed for reproducibility
         if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
+            self.rng = random.Random(seed)
         elif self.seed is not None:
-            random.seed(self.seed)
-            np.random.seed(self.seed)
+            self.rng = random.Random(self.seed)
+        rng = self.rng
 
         # Regenerate random counts for traps and treasures
-        num_traps = random.randint(2, 3)
-        num_treasures = random.randint(2, 4)
+        num_traps = rng.randint(2, 3)
+        num_treasures = rng.randint(2, 4)
 
-        # Initialize empty grid
-        self.grid = [[' ' for _ in range(self.n)] for _ in range(self.n)]
         self.end = []
         self.traps = []
         self.walls = []
+        self._compiled = None
+        self._tiles = None
+        self._treasure_fields = {}
+        self._landmarks = None
+        self.carved_walls = 0
+
+        if self.generator == 'fast':
+            return self._generate_fast(rng, num_traps, num_treasures)
+
+        # Initialize empty grid
+        self.grid = [[' ' for _ in range(self.n)] for _ in range(self.n)]
 
         # Add treasures
         for i in range(num_treasures):
             while True:
-                treasure = (random.randint(0, self.n - 1), random.randint(0, self.n - 1))
+                treasure = (rng.randint(0, self.n - 1), rng.randint(0, self.n - 1))
                 if treasure not in self.end:
                     break
             self.grid[treasure[0]][treasure[1]] = 'T'
@@ -43,7 +75,7 @@ class Grid:
 
         # Create Start 1 position (Player 1 / AI)
         while True:
-            start1 = (random.randint(0, self.n - 1), random.randint(0, self.n - 1))
+            start1 = (rng.randint(0, self.n - 1), rng.randint(0, self.n - 1))
             if start1 not in self.end:
                 self.grid[start1[0]][start1[1]] = 'S'
                 self.start1 = (start1[0], start1[1])
@@ -52,7 +84,7 @@ class Grid:
 
         # Create Start 2 position (Player 2 / Human)
         while True:
-            start2 = (random.randint(0, self.n - 1), random.randint(0, self.n - 1))
+            start2 = (rng.randint(0, self.n - 1), rng.randint(0, self.n - 1))
             if start2 not in self.end and start2 != self.start1:
                 self.grid[start2[0]][start2[1]] = 'S'
                 self.start2 = (start2[0], start2[1])
@@ -61,17 +93,17 @@ class Grid:
         # Create traps
         for i in range(num_traps):
             while True:
-                trap = (random.randint(0, self.n - 1), random.randint(0, self.n - 1))
+                trap = (rng.randint(0, self.n - 1), rng.randint(0, self.n - 1))
                 if trap not in self.end and trap != self.start1 and trap != self.start2 and trap not in self.traps:
                     self.grid[trap[0]][trap[1]] = 'X'
                     self.traps.append(trap)
                     break
 
         # Create walls
-        num_walls = random.randint(int(self.n ** 2 * 0.1), int(self.n ** 2 * 0.15))
+        num_walls = rng.randint(int(self.n ** 2 * 0.1), int(self.n ** 2 * 0.15))
         placed = 0
         while placed < num_walls:
-            i, j = random.randint(0, self.n - 1), random.randint(0, self.n - 1)
+            i, j = rng.randint(0, self.n - 1), rng.randint(0, self.n - 1)
             if self.grid[i][j] == ' ':
                 self.grid[i][j] = '#'
                 self.walls.append((i, j))
@@ -79,6 +111,80 @@ class Grid:
 
         return self.grid
 
+    def _generate_fast(self, rng, num_traps, num_treasures):
+        n = self.n
+        num_cells = n * n
+        num_walls = rng.randint(int(num_cells * 0.1), int(num_cells * 0.15))
+        sampler = np.random.default_rng(rng.getrandbits(128))
+
+        # Treasures, both starts and traps on distinct cells, then walls on distinct empty cells
+        tiles = np.full(num_cells, EMPTY, dtype=np.uint8)
+        special = sampler.choice(num_cells, num_treasures + 2 + num_traps, replace=False)
+        treasures, starts, traps = np.split(special, [num_treasures, num_treasures + 2])
+        tiles[treasures] = TREASURE
+        tiles[starts] = START
+        tiles[traps] = TRAP
+
+        empty = np.flatnonzero(tiles == EMPTY)
+        tiles[sampler.choice(empty, min(num_walls, len(empty)), replace=False)] = WALL
+        tiles = tiles.reshape(n, n)
+
+        self.end = [divmod(int(idx), n) for idx in treasures]
+        self.start1, self.start2 = [divmod(int(idx), n) for idx in starts]
+        self.start = self.start1
+        self.traps = [divmod(int(idx), n) for idx in traps]
+
+        # One flood fill labels every open region; anything not in start1's region gets an
+        # L-shaped corridor (along its own column, then along start1's row) with the walls cleared
+        labels = label_regions(tiles != WALL)
+        home = labels[self.start1]
+        for target in self.end + [self.start2]:
+            if labels[target] != home:
+                self.carved_walls += self._carve_corridor(tiles, target, self.start1)
+
+        self._tiles = tiles
+        self.grid = TILE_CHARS[tiles].tolist()
+        wall_rows, wall_cols = np.nonzero(tiles == WALL)
+        self.walls = list(zip(wall_rows.tolist(), wall_cols.tolist()))
+        return self.grid
+
+    @staticmethod
+    def _carve_corridor(tiles, source, target):
+        (r0, c0), (r1, c1) = source, target
+        vertical = tiles[min(r0, r1):max(r0, r1) + 1, c0]
+        horizontal = tiles[r1, min(c0, c1):max(c0, c1) + 1]
+        carved = int(np.count_nonzero(vertical == WALL) + np.count_nonzero(horizontal == WALL))
+        vertical[vertical == WALL] = EMPTY
+        horizontal[horizontal == WALL] = EMPTY
+        return carved
+
+    @property
+    def compiled(self):
+        # Tile/cost arrays and neighbor tables, rebuilt once per generated grid
+        if self._compiled is None:
+            self._compiled = CompiledGrid(self.grid, tiles=self._tiles)
+        return self._compiled
+
+    def treasure_field(self, treasure):
+        # Reverse Dijkstra distance/next-hop field of one treasure, computed once per generated
+        # grid and shared by every runner on it (both players search toward the same treasures)
+        # Returns (distance, next_hop, expanded), expanded is 0 when the field was already cached
+        field = self._treasure_fields.get(treasure)
+        if field is not None:
+            return field[0], field[1], 0
+
+        distance, next_hop, expanded = treasure_field(self.compiled, treasure)
+        self._treasure_fields[treasure] = (distance, next_hop)
+        return distance, next_hop, expanded
+
+    @property
+    def landmarks(self):
+        # LANDMARKS farthest-point landmarks with their true-cost distance arrays, for
+        # A_Star(..., landmarks=grid.landmarks); selected once per generated grid, from start1's region
+        if self._landmarks is None:
+            self._landmarks = Landmarks.select(self.compiled, self.LANDMARKS, first=self.start1)
+        return self._landmarks
+
     def get_tile(self, row, col):
         if 0 <= row < self.n and 0 <= col < self.n:
             return self.grid[row][col]
@@ -1,20 +1,18 @@
+from Algorithms.compiled_grid import compile_grid
+
+
 class PathCostCalculator:
     @staticmethod
     def calculate_cost(solution_path, grid):
         if not solution_path:
             return 0
 
-        total_cost = 0
-        for i, (row, col) in enumerate(solution_path):
-            if i == 0:
-                continue
+        # Step costs come from the compiled cost table: 0 for S/T, 5 for X, 1 otherwise
+        grid = compile_grid(grid)
+        step_cost = grid.step_cost
 
-            tile = grid[row][col]
-            if tile in ['S', 'T']:
-                total_cost += 0
-            elif tile == 'X':
-                total_cost += 5
-            else:
-                total_cost += 1
+        total_cost = 0
+        for row, col in solution_path[1:]:
+            total_cost += step_cost[row * grid.n + col]
 
         return total_cost
@@ -0,0 +1,24 @@
+import random
+import numpy as np
+
+
+class RunStreams:
+    #independent random streams for one run, spawned from a single root seed
+    #each component draws only from its own stream, so a run is reproducible from the root
+    #seed alone: seeding or consuming one stream never shifts another, and the order runs
+    #execute in (or the worker they land on) does not matter
+
+    COMPONENTS = ('grid', 'sensor', 'opponent')
+
+    def __init__(self, root_seed=None):
+        self.seed_sequence = np.random.SeedSequence(root_seed)
+        grid_seq, sensor_seq, opponent_seq = self.seed_sequence.spawn(len(self.COMPONENTS))
+
+        self.grid = random.Random(self._python_seed(grid_seq))  #Grid(rng=...)
+        self.sensor = np.random.default_rng(sensor_seq)  #SensorModel(seed=...)
+        self.opponent = random.Random(self._python_seed(opponent_seq))  #SearchContext(rng=...)
+
+    @staticmethod
+    def _python_seed(seed_sequence):
+        #128-bit integer seed for a random.Random, drawn from the child sequence
+        return int.from_bytes(seed_sequence.generate_state(4).tobytes(), 'little')
@@ -0,0 +1,208 @@
+import json
+import struct
+import sys
+from logging import DEBUG, INFO, WARNING
+import numpy as np
+
+#structured run events, each one a level, a name and a dict of fields, fanned out to sinks
+#a RunLog drops anything below the lowest sink level before it is built, and belief heatmaps
+#are snapshots: the runner hands over a function that produces the grid, and it is only
+#called when a sink at that level asked for snapshots. with no sinks a run logs nothing
+
+__all__ = ['DEBUG', 'INFO', 'WARNING', 'RunLog', 'NullSink', 'ConsoleSink', 'JsonlSink',
+           'BinarySink', 'read_binary_log', 'format_grid']
+
+
+def format_grid(values):
+    #one line per row, 4 decimals per cell, the old print_belief_grid layout
+    return "\n".join(" ".join(f"{value:.4f}" for value in row) for row in values)
+
+
+def _json_default(value):
+    #numpy scalars and arrays from the belief map
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _dumps(record):
+    return json.dumps(record, default=_json_default, separators=(',', ':'))
+
+
+class NullSink:
+    #takes nothing, for callers that want to say "no logging" explicitly
+    level = float('inf')
+    snapshots = False
+
+    def write_event(self, level, name, message, fields):
+        pass
+
+    def write_snapshot(self, level, name, values, fields):
+        pass
+
+    def close(self):
+        pass
+
+
+class ConsoleSink:
+    #human readable text, what the runners used to print. snapshots print as a heatmap grid
+    def __init__(self, level=INFO, snapshots=False, stream=None):
+        self.level = level
+        self.snapshots = snapshots
+        self.stream = stream
+
+    def _print(self, text):
+        print(text, file=self.stream or sys.stdout)
+
+    def write_event(self, level, name, message, fields):
+        if message is None:
+            message = f"{name} " + " ".join(f"{key}={value}" for key, value in fields.items())
+        self._print(message)
+
+    def write_snapshot(self, level, name, values, fields):
+        self._print(f"\n=== {fields.get('title', name)} ===")
+        self._print(format_grid(values))
+
+    def close(self):
+        pass
+
+
+class _FileSink:
+    #a sink writing to a path it opens itself, or to a file object the caller owns
+    mode = 'w'
+
+    def __init__(self, target, level=DEBUG, snapshots=False):
+        self.level = level
+        self.snapshots = snapshots
+        self._owns_file = isinstance(target, str)
+        self.file = open(target, self.mode) if self._owns_file else target
+
+    def close(self):
+        if self._owns_file:
+            self.file.close()
+        else:
+            self.file.flush()
+
+
+class JsonlSink(_FileSink):
+    #one JSON object per line: {"level", "event", **fields}, snapshots add "values"
+    def write_event(self, level, name, message, fields):
+        self.file.write(_dumps({'level': level, 'event': name, **fields}) + "\n")
+
+    def write_snapshot(self, level, name, values, fields):
+        self.file.write(_dumps({'level': level, 'event': name, **fields, 'values': values}) + "\n")
+
+
+class BinarySink(_FileSink):
+    #length-prefixed records after a magic header, read back with read_binary_log
+    #record: kind u8, level u8, name length u16, payload length u32, name, payload
+    #events carry compact JSON fields, snapshots carry their fields followed by rows u32,
+    #cols u32 and the grid as float32, a quarter of the size of the text heatmap per cell
+    mode = 'wb'
+    MAGIC = b'THLOG\x01'
+    RECORD = struct.Struct('<BBHI')
+    SHAPE = struct.Struct('<II')
+    EVENT, SNAPSHOT = 0, 1
+
+    def __init__(self, target, level=DEBUG, snapshots=True):
+        super().__init__(target, level, snapshots)
+        self.file.write(self.MAGIC)
+
+    def _write(self, kind, level, name, payload):
+        name = name.encode()
+        self.file.write(self.RECORD.pack(kind, level, len(name), len(payload)))
+        self.file.write(name)
+        self.file.write(payload)
+
+    def write_event(self, level, name, message, fields):
+        self._write(self.EVENT, level, name, _dumps(fields).encode())
+
+    def write_snapshot(self, level, name, values, fields):
+        values = np.asarray(values, dtype='<f4')
+        header = _dumps(fields).encode()
+        payload = (struct.pack('<I', len(header)) + header + self.SHAPE.pack(*values.shape)
+                   + values.tobytes())
+        self._write(self.SNAPSHOT, level, name, payload)
+
+
+def read_binary_log(path):
+    #yields {'level', 'event', **fields} dicts, snapshots with their grid under 'values'
+    with open(path, 'rb') as file:
+        if file.read(len(BinarySink.MAGIC)) != BinarySink.MAGIC:
+            raise ValueError(f"{path} is not a binary run log")
+        while True:
+            header = file.read(BinarySink.RECORD.size)
+            if not header:
+                return
+            kind, level, name_length, payload_length = BinarySink.RECORD.unpack(header)
+            name = file.read(name_length).decode()
+            payload = file.read(payload_length)
+
+            if kind == BinarySink.EVENT:
+                yield {'level': level, 'event': name, **json.loads(payload)}
+                continue
+
+            (fields_length,) = struct.unpack_from('<I', payload)
+            fields = json.loads(payload[4:4 + fields_length])
+            offset = 4 + fields_length
+            rows, cols = BinarySink.SHAPE.unpack_from(payload, offset)
+            values = np.frombuffer(payload, dtype='<f4', offset=offset + BinarySink.SHAPE.size)
+            yield {'level': level, 'event': name, **fields, 'values': values.reshape(rows, cols)}
+
+
+class RunLog:
+    def __init__(self, sinks=()):
+        self.sinks = list(sinks)
+        #lowest level any sink takes, and the same for sinks that take snapshots
+        self.level = min((sink.level for sink in self.sinks), default=None)
+        self.snapshot_level = min((sink.level for sink in self.sinks if sink.snapshots), default=None)
+
+    @classmethod
+    def console(cls, level=INFO, snapshots=False):
+        #the default for interactive runs: the run summary on stdout, nothing else
+        return cls([ConsoleSink(level, snapshots)])
+
+    def enabled(self, level):
+        #callers check this before building anything expensive for an event
+        return self.level is not None and level >= self.level
+
+    def wants_snapshot(self, level):
+        return self.snapshot_level is not None and level >= self.snapshot_level
+
+    def event(self, level, name, message=None, **fields):
+        #message is the console text, structured sinks only keep the fields
+        if not self.enabled(level):
+            return
+        for sink in self.sinks:
+            if level >= sink.level:
+                sink.write_event(level, name, message, fields)
+
+    def debug(self, name, message=None, **fields):
+        self.event(DEBUG, name, message, **fields)
+
+    def info(self, name, message=None, **fields):
+        self.event(INFO, name, message, **fields)
+
+    def warning(self, name, message=None, **fields):
+        self.event(WARNING, name, message, **fields)
+
+    def snapshot(self, level, name, produce, **fields):
+        #produce() returns the grid, called at most once and only if a sink wants it
+        if not self.wants_snapshot(level):
+            return
+        values = produce()
+        for sink in self.sinks:
+            if sink.snapshots and level >= sink.level:
+                sink.write_snapshot(level, name, values, fields)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,4 +1,6 @@
-import random
+from collections import OrderedDict
+import numpy as np
+from Algorithms.compiled_grid import compile_grid, TILE_CHARS, EMPTY, TREASURE, TRAP
 
 
 class SensorModel:
@@ -11,12 +13,29 @@ class SensorModel:
         'high': {'false_positive': 0.15, 'false_negative': 0.30}
     }
 
-    def __init__(self, noise_level='none'):
+    # Share of false positives that show up as a treasure, the rest show up as a trap
+    FALSE_TREASURE_SHARE = 0.7
+
+    # Default number of cached observations, enough for every cell of a 256x256 grid
+    DEFAULT_CACHE_CAPACITY = 1 << 16
+
+    def __init__(self, noise_level='none', seed=None, cache_capacity=DEFAULT_CACHE_CAPACITY):
         self.noise_level = noise_level
+        # All noise is drawn from this generator; seed is an int, a SeedSequence or a Generator to share
+        self.rng = np.random.default_rng(seed)
+
+        # Cache noisy observations to prevent flickering: (row, col) -> (epoch, observation)
+        # in least recently used order. Entries from an older epoch are stale, so invalidating
+        # is a counter bump and stale entries are overwritten or evicted as they come up
+        self.cached_observations = OrderedDict()
+        self.cache_capacity = cache_capacity
+        self.cache_epoch = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
+
+        self.scan_count = 0  # Track number of scans performed, independent of the cache
         self.set_noise_level(noise_level)
-        self.cached_observations = {}  # Cache noisy observations to prevent flickering
-        self.cache_valid = False
-        self.scan_count = 0  # Track number of scans performed
 
     def set_noise_level(self, noise_level):
         if noise_level not in self.NOISE_LEVELS:
@@ -29,30 +48,48 @@ class SensorModel:
         self.invalidate_cache()
 
     def invalidate_cache(self):
-        self.cached_observations = {}
-        self.cache_valid = False
-        self.scan_count = 0  # Reset scan count
+        # O(1): every cached observation from an earlier epoch stops counting as a hit
+        self.cache_epoch += 1
+
+    def cache_stats(self):
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'capacity': self.cache_capacity,
+            'size': len(self.cached_observations),
+            'epoch': self.cache_epoch,
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'evictions': self.cache_evictions,
+            'hit_rate': self.cache_hits / lookups if lookups else 0.0
+        }
+
+    def _cache_get(self, cache_key):
+        entry = self.cached_observations.get(cache_key)
+        if entry is not None and entry[0] == self.cache_epoch:
+            self.cached_observations.move_to_end(cache_key)
+            self.cache_hits += 1
+            return entry[1]
+        self.cache_misses += 1
+        return None
+
+    def _cache_put(self, cache_key, observation):
+        self.cached_observations[cache_key] = (self.cache_epoch, observation)
+        self.cached_observations.move_to_end(cache_key)
+        if self.cache_capacity is not None and len(self.cached_observations) > self.cache_capacity:
+            self.cached_observations.popitem(last=False)
+            self.cache_evictions += 1
 
     def scan_cell_cached(self, grid_instance, row, col):
         cache_key = (row, col)
-        if cache_key not in self.cached_observations:
-            # Get the actual tile value first
-            actual_value = grid_instance.get_tile(row, col)
-
-            # Return None for out-of-bounds positions
-            if actual_value is None:
+        observation = self._cache_get(cache_key)
+        if observation is None:
+            # scan_cell counts the scan and returns None for out-of-bounds positions
+            observation = self.scan_cell(grid_instance, row, col)
+            if observation is None:
                 return None
+            self._cache_put(cache_key, observation)
 
-            # Increment scan count
-            self.scan_count += 1
-
-            # No noise for walls and start positions - these are always visible correctly
-            if actual_value in ['#', 'S']:
-                self.cached_observations[cache_key] = actual_value
-            else:
-                self.cached_observations[cache_key] = self._apply_noise(actual_value)
-
-        return self.cached_observations[cache_key]
+        return observation
 
     def scan_cell(self, grid_instance, row, col):
         # Get the actual tile value first
@@ -72,56 +109,103 @@ class SensorModel:
         return self._apply_noise(actual_value)
 
     def scan_neighborhood(self, grid_instance, row, col, radius=1):
-        observations = {}
+        # Whole (2r+1)^2 window, clipped to the grid, sampled in one call; keys in row-major order
+        n = grid_instance.n
+        r0, r1 = max(row - radius, 0), min(row + radius + 1, n)
+        c0, c1 = max(col - radius, 0), min(col + radius + 1, n)
+        window = TILE_CHARS[self.sample_tiles(self._tiles(grid_instance)[r0:r1, c0:c1])].tolist()
+        self.scan_count += (r1 - r0) * (c1 - c0)
 
-        for dr in range(-radius, radius + 1):
-            for dc in range(-radius, radius + 1):
-                r, c = row + dr, col + dc
-                if 0 <= r < grid_instance.n and 0 <= c < grid_instance.n:
-                    observations[(r, c)] = self.scan_cell(grid_instance, r, c)
+        observations = {}
+        for r, window_row in zip(range(r0, r1), window):
+            for c, obs in zip(range(c0, c1), window_row):
+                observations[(r, c)] = obs
 
         return observations
 
+    def sample_tiles(self, tiles):
+        # Noisy copy of an array of tile codes (any shape), same rules as _apply_noise per cell
+        noisy = np.array(tiles, dtype=np.uint8)
+        if self.noise_level == 'none':
+            return noisy
+
+        draws = self.rng.random((2,) + noisy.shape)
+
+        # False negative: treasure/trap appears as empty
+        hidden = ((noisy == TREASURE) | (noisy == TRAP)) & (draws[0] < self.false_negative_rate)
+
+        # False positive: empty space appears as treasure or trap
+        spurious = (noisy == EMPTY) & (draws[0] < self.false_positive_rate)
+        noisy[spurious] = np.where(draws[1][spurious] < self.FALSE_TREASURE_SHARE, TREASURE, TRAP)
+        noisy[hidden] = EMPTY
+
+        # Walls and starts are never touched, so they are always seen correctly
+        return noisy
+
+    def sample_grid(self, grid_instance):
+        # Whole noisy observation grid as an n x n array of tile characters
+        self.scan_count += grid_instance.n * grid_instance.n
+        return TILE_CHARS[self.sample_tiles(self._tiles(grid_instance))]
+
+    @staticmethod
+    def _tiles(grid_instance):
+        compiled = grid_instance.compiled if hasattr(grid_instance, 'compiled') else compile_grid(grid_instance)
+        return compiled.tiles
+
     def _apply_noise(self, actual_value):
         if self.noise_level == 'none':
             return actual_value
 
         # False negative: treasure/trap appears as empty
         if actual_value in ['T', 'X']:
-            if random.random() < self.false_negative_rate:
+            if self.rng.random() < self.false_negative_rate:
                 return ' '
 
         # False positive: empty space appears as treasure
         if actual_value == ' ':
-            if random.random() < self.false_positive_rate:
+            if self.rng.random() < self.false_positive_rate:
                 # Randomly choose between treasure or trap
-                return 'T' if random.random() < 0.7 else 'X'
+                return 'T' if self.rng.random() < self.FALSE_TREASURE_SHARE else 'X'
 
         return actual_value
 
     def get_noisy_grid_view(self, grid_instance, revealed_positions=None):
-        noisy_view = {}
-
         if revealed_positions is None:
             # Scan entire grid
-            for i in range(grid_instance.n):
-                for j in range(grid_instance.n):
-                    noisy_view[(i, j)] = self.scan_cell(grid_instance, i, j)
-        else:
-            # Scan only revealed positions
-            for pos in revealed_positions:
-                i, j = pos
-                noisy_view[(i, j)] = self.scan_cell(grid_instance, i, j)
+            n = grid_instance.n
+            noisy = self.sample_grid(grid_instance).ravel().tolist()
+            return {divmod(idx, n): obs for idx, obs in enumerate(noisy)}
 
+        # Scan only revealed positions, out-of-bounds ones stay None and are not scanned,
+        # like scan_cell (negative indices would otherwise wrap around to the far edge)
+        n = grid_instance.n
+        revealed_positions = [(int(i), int(j)) for i, j in revealed_positions]
+        noisy_view = dict.fromkeys(revealed_positions)
+        positions = [(i, j) for i, j in revealed_positions if 0 <= i < n and 0 <= j < n]
+        if not positions:
+            return noisy_view
+        rows, cols = np.array(positions).T
+        noisy = TILE_CHARS[self.sample_tiles(self._tiles(grid_instance)[rows, cols])].tolist()
+        self.scan_count += len(positions)
+        noisy_view.update(zip(positions, noisy))
         return noisy_view
 
     def create_noisy_grid(self, grid_instance):
+        # Fresh sample for every cell not yet cached, cached cells keep their observation
         n = grid_instance.n
-        noisy_grid = [[' ' for _ in range(n)] for _ in range(n)]
+        noisy_grid = self.sample_tiles(self._tiles(grid_instance))
+        noisy_grid = TILE_CHARS[noisy_grid].tolist()
 
         for i in range(n):
+            row = noisy_grid[i]
             for j in range(n):
-                noisy_grid[i][j] = self.scan_cell_cached(grid_instance, i, j)
+                cache_key = (i, j)
+                observation = self._cache_get(cache_key)
+                if observation is None:
+                    self._cache_put(cache_key, row[j])
+                    self.scan_count += 1
+                else:
+                    row[j] = observation
 
         return noisy_grid
 
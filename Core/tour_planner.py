@@ -0,0 +1,125 @@
+import math
+from Algorithms.multi_target import multi_target_sweep
+
+
+class TourPlanner:
+    # Orders treasures by true path cost instead of straight-line distance
+    # Exact (Held-Karp) up to EXACT_LIMIT treasures, nearest neighbour + 2-opt beyond that
+
+    EXACT_LIMIT = 12
+
+    @staticmethod
+    def build_cost_matrix(compiled_grid, start_pos, treasures):
+        # Row/column 0 is the start, 1..k are the treasures; unreachable pairs are inf
+        points = [start_pos] + list(treasures)
+        matrix = [[math.inf] * len(points) for _ in points]
+        expanded_nodes = 0
+
+        for i, source in enumerate(points):
+            distances, _, expanded = multi_target_sweep(compiled_grid, source, points, weighted=True)
+            expanded_nodes += expanded
+            for j, target in enumerate(points):
+                if target in distances:
+                    matrix[i][j] = distances[target]
+
+        return matrix, expanded_nodes
+
+    @staticmethod
+    def tour_cost(matrix, order):
+        # Cost of visiting matrix indices in order, starting from index 0
+        total = 0
+        previous = 0
+        for index in order:
+            total += matrix[previous][index]
+            previous = index
+        return total
+
+    @staticmethod
+    def solve_exact(matrix):
+        # Held-Karp over the open path 0 -> all treasures, O(2^k * k^2)
+        k = len(matrix) - 1
+        if k == 0:
+            return []
+
+        full = (1 << k) - 1
+        best = [[math.inf] * k for _ in range(1 << k)]
+        back = [[-1] * k for _ in range(1 << k)]
+        for j in range(k):
+            best[1 << j][j] = matrix[0][j + 1]
+
+        for mask in range(1, full + 1):
+            row = best[mask]
+            for j in range(k):
+                cost = row[j]
+                if cost == math.inf or not (mask >> j) & 1:
+                    continue
+                for nxt in range(k):
+                    if (mask >> nxt) & 1:
+                        continue
+                    next_mask = mask | (1 << nxt)
+                    new_cost = cost + matrix[j + 1][nxt + 1]
+                    if new_cost < best[next_mask][nxt]:
+                        best[next_mask][nxt] = new_cost
+                        back[next_mask][nxt] = j
+
+        last = min(range(k), key=lambda j: best[full][j])
+        order = []
+        mask = full
+        while last != -1:
+            order.append(last + 1)
+            previous = back[mask][last]
+            mask ^= 1 << last
+            last = previous
+        order.reverse()
+        return order
+
+    @staticmethod
+    def solve_heuristic(matrix):
+        # Nearest neighbour construction followed by 2-opt segment reversals
+        k = len(matrix) - 1
+        unvisited = set(range(1, k + 1))
+        order = []
+        current = 0
+        while unvisited:
+            current = min(unvisited, key=lambda j: (matrix[current][j], j))
+            order.append(current)
+            unvisited.remove(current)
+
+        best_cost = TourPlanner.tour_cost(matrix, order)
+        improved = True
+        while improved:
+            improved = False
+            for i in range(k - 1):
+                for j in range(i + 1, k):
+                    candidate = order[:i] + order[i:j + 1][::-1] + order[j + 1:]
+                    candidate_cost = TourPlanner.tour_cost(matrix, candidate)
+                    if candidate_cost < best_cost:
+                        order, best_cost = candidate, candidate_cost
+                        improved = True
+
+        return order
+
+    @staticmethod
+    def plan_tour(compiled_grid, treasures, start_pos):
+        # Returns ({treasure: leg cost} in visiting order, tour cost, cost matrix, planning expansions)
+        treasures = list(treasures)
+        matrix, expanded_nodes = TourPlanner.build_cost_matrix(compiled_grid, start_pos, treasures)
+
+        # Treasures the start cannot reach are left out of the tour
+        reachable = [i for i in range(1, len(matrix)) if matrix[0][i] != math.inf]
+        keep = [0] + reachable
+        sub_matrix = [[matrix[a][b] for b in keep] for a in keep]
+
+        if len(reachable) <= TourPlanner.EXACT_LIMIT:
+            sub_order = TourPlanner.solve_exact(sub_matrix)
+        else:
+            sub_order = TourPlanner.solve_heuristic(sub_matrix)
+        order = [keep[i] for i in sub_order]
+
+        tour = {}
+        previous = 0
+        for index in order:
+            tour[treasures[index - 1]] = matrix[previous][index]
+            previous = index
+
+        return tour, TourPlanner.tour_cost(matrix, order), matrix, expanded_nodes
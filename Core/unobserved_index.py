@@ -0,0 +1,85 @@
+import numpy as np
+
+
+class UnobservedIndex:
+    #cells nobody has observed yet (walls count as observed), with a coarse count per
+    #BLOCK x BLOCK block so the nearest one can be found by searching outward from a
+    #position block ring by block ring. a lookup only visits blocks up to the answer's
+    #distance, so its cost depends on how far away the nearest unobserved cell is, not on
+    #how big the grid is; marking a cell observed is O(1)
+
+    BLOCK = 8
+
+    def __init__(self, n):
+        self.n = n
+        self.mask = np.ones((n, n), dtype=bool)
+        blocks = -(-n // self.BLOCK)
+        block_sizes = np.minimum(self.BLOCK, n - np.arange(blocks) * self.BLOCK)  #last block may be short
+        self.block_counts = np.outer(block_sizes, block_sizes)
+        self.count = n * n
+
+    def mark_observed(self, position):
+        if self.mask[position]:
+            self.mask[position] = False
+            self.block_counts[position[0] // self.BLOCK, position[1] // self.BLOCK] -= 1
+            self.count -= 1
+
+    def mark_all_observed(self, positions):
+        positions = np.array(list(positions), dtype=np.int64).reshape(-1, 2)
+        cells = np.unique(positions[:, 0] * self.n + positions[:, 1])
+        rows, cols = np.divmod(cells, self.n)
+        newly = self.mask[rows, cols]
+        rows, cols = rows[newly], cols[newly]
+        self.mask[rows, cols] = False
+        np.add.at(self.block_counts, (rows // self.BLOCK, cols // self.BLOCK), -1)
+        self.count -= len(rows)
+
+    def nearest(self, position):
+        #closest unobserved cell by Manhattan distance, ties to the first in row-major order
+        if self.count == 0:
+            return None
+
+        B = self.BLOCK
+        row, col = position
+        block_row, block_col = row // B, col // B
+        blocks = len(self.block_counts)
+        best = None
+
+        for ring in range(blocks):
+            #every cell of a block on this ring is at least this far away
+            if best is not None and (ring - 1) * B + 1 > best[0]:
+                break
+
+            for br, bc in self._ring(block_row, block_col, ring, blocks):
+                if not self.block_counts[br, bc]:
+                    continue
+                cell_rows, cell_cols = np.nonzero(self.mask[br * B:(br + 1) * B, bc * B:(bc + 1) * B])
+                cell_rows += br * B
+                cell_cols += bc * B
+                distances = np.abs(cell_rows - row) + np.abs(cell_cols - col)
+                # lexsort keys run last to first: distance, then row, then column
+                k = np.lexsort((cell_cols, cell_rows, distances))[0]
+                candidate = (int(distances[k]), int(cell_rows[k]), int(cell_cols[k]))
+                if best is None or candidate < best:
+                    best = candidate
+
+        return (best[1], best[2]) if best is not None else None
+
+    @staticmethod
+    def _ring(block_row, block_col, ring, blocks):
+        #blocks at Chebyshev distance ring around (block_row, block_col), clipped to the grid
+        if ring == 0:
+            yield block_row, block_col
+            return
+        top, bottom = block_row - ring, block_row + ring
+        left, right = max(block_col - ring, 0), min(block_col + ring, blocks - 1)
+        for bc in range(left, right + 1):
+            if top >= 0:
+                yield top, bc
+            if bottom < blocks:
+                yield bottom, bc
+        for br in range(max(top + 1, 0), min(bottom, blocks)):
+            if block_col - ring >= 0:
+                yield br, block_col - ring
+            if block_col + ring < blocks:
+                yield br, block_col + ring
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from Core.belief_store import (ProbabilityBeliefs, LogOddsBeliefs, OBSERVED_TREASURE, OBSERVED_EMPTY,
+                               OBSERVED_BLOCKED)
+
+N = 8
+FP_RATE, FN_RATE = 0.08, 0.15
+WALLS = [(0, 0), (1, 3), (4, 4), (7, 2)]
+
+
+def exact_entropy(probabilities):
+    positive = probabilities[probabilities > 0]
+    return float(-np.sum(positive * np.log(positive)))
+
+
+def both_stores(remaining=3):
+    stores = ProbabilityBeliefs(N), LogOddsBeliefs(N)
+    for store in stores:
+        store.initialize(WALLS, remaining)
+    return stores
+
+
+def sequential_reference(beliefs, positions, codes, remaining):
+    #the original update_belief: Bayes rule on one cell, then renormalize the grid, cell by cell
+    beliefs = beliefs.copy()
+    for position, code in zip(positions, codes):
+        if code == OBSERVED_BLOCKED:
+            beliefs[position] = 0.0
+        else:
+            likelihood_treasure = 1.0 - FN_RATE if code == OBSERVED_TREASURE else FN_RATE
+            likelihood_empty = FP_RATE if code == OBSERVED_TREASURE else 1.0 - FP_RATE
+            prior = beliefs[position]
+            p_obs = likelihood_treasure * prior + likelihood_empty * (1.0 - prior)
+            beliefs[position] = likelihood_treasure * prior / p_obs if p_obs > 0 else prior
+        total = np.sum(beliefs)
+        if total > 0:
+            beliefs *= remaining / total
+    return beliefs
+
+
+def test_stores_match_after_initialize():
+    probability, log_odds = both_stores()
+    np.testing.assert_allclose(log_odds.probabilities(), probability.probabilities(), rtol=1e-12)
+    assert np.isclose(log_odds.entropy(), probability.entropy(), rtol=1e-12)
+
+
+@pytest.mark.parametrize('code', [OBSERVED_TREASURE, OBSERVED_EMPTY, OBSERVED_BLOCKED])
+def test_stores_match_after_single_cell_observe(code):
+    probability, log_odds = both_stores()
+    for store in (probability, log_odds):
+        store.observe([(2, 5)], [code], FP_RATE, FN_RATE, 3)
+    np.testing.assert_allclose(log_odds.probabilities(), probability.probabilities(), rtol=1e-9, atol=1e-15)
+    assert np.isclose(log_odds.entropy(), probability.entropy(), rtol=1e-9)
+
+
+def test_stores_match_after_zero_and_clear():
+    probability, log_odds = both_stores()
+    for store in (probability, log_odds):
+        store.zero((3, 6), 2)
+    np.testing.assert_allclose(log_odds.probabilities(), probability.probabilities(), rtol=1e-12, atol=1e-15)
+    assert np.isclose(log_odds.entropy(), probability.entropy(), rtol=1e-12)
+
+    for store in (probability, log_odds):
+        store.clear()
+    np.testing.assert_array_equal(log_odds.probabilities(), probability.probabilities())
+    assert log_odds.entropy() == probability.entropy() == 0.0
+    #-0.0 compares equal to 0.0 but prints as -0.0000 in the run summary
+    assert f"{probability.entropy():.4f}" == f"{log_odds.entropy():.4f}" == "0.0000"
+
+
+def test_log_odds_entropy_is_exact_entropy_of_probabilities():
+    _, log_odds = both_stores()
+    rng = np.random.default_rng(7)
+    for remaining in (3, 3, 2, 2, 1):
+        cells = rng.choice(N * N, size=9, replace=False)
+        positions = [divmod(int(cell), N) for cell in cells]
+        codes = rng.choice([OBSERVED_TREASURE, OBSERVED_EMPTY, OBSERVED_BLOCKED], size=9, p=[0.3, 0.6, 0.1])
+        log_odds.observe(positions, codes, FP_RATE, FN_RATE, remaining)
+        assert np.isclose(log_odds.entropy(), exact_entropy(log_odds.probabilities()), rtol=1e-9)
+
+
+def test_probability_observe_matches_sequential_bayes():
+    probability, _ = both_stores()
+    rng = np.random.default_rng(3)
+    for _ in range(5):
+        cells = rng.choice(N * N, size=12, replace=False)
+        positions = [divmod(int(cell), N) for cell in cells]
+        codes = rng.choice([OBSERVED_TREASURE, OBSERVED_EMPTY, OBSERVED_BLOCKED], size=12, p=[0.3, 0.6, 0.1])
+
+        expected = sequential_reference(probability.probabilities(), positions, codes, 3)
+        probability.observe(positions, codes, FP_RATE, FN_RATE, 3)
+
+        np.testing.assert_allclose(probability.probabilities(), expected, rtol=1e-9, atol=1e-15)
+        assert np.isclose(probability.entropy(), exact_entropy(expected), rtol=1e-9)
@@ -0,0 +1,30 @@
+from Core.grid_game import Grid
+from Core.sensor_model import SensorModel
+
+
+def make_grid(n=6, seed=3):
+    grid = Grid(n=n, seed=seed)
+    grid.generate_grid()
+    return grid
+
+
+def test_revealed_view_matches_scan_cell_out_of_bounds():
+    #scan_cell returns None for positions off the grid and does not count them as scans
+    grid = make_grid()
+    sensor = SensorModel('none')
+    positions = [(-1, 0), (0, -1), (1, 2), (6, 0), (0, 6), (5, 5)]
+    view = sensor.get_noisy_grid_view(grid, revealed_positions=positions)
+
+    assert list(view) == positions
+    assert view[(1, 2)] == grid.get_tile(1, 2)
+    assert view[(5, 5)] == grid.get_tile(5, 5)
+    for position in [(-1, 0), (0, -1), (6, 0), (0, 6)]:
+        assert view[position] is None
+    assert sensor.get_scan_count() == 2
+
+
+def test_revealed_view_all_out_of_bounds():
+    sensor = SensorModel('low', seed=0)
+    assert sensor.get_noisy_grid_view(make_grid(), revealed_positions=[(-1, -1), (9, 9)]) == {(-1, -1): None,
+                                                                                              (9, 9): None}
+    assert sensor.get_scan_count() == 0